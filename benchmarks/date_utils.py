@@ -0,0 +1,88 @@
+"""
+Date Utilities Benchmark
+
+Compares the arithmetic helpers in ``utils.dates`` with the previous
+day-by-day implementations of ``utils.help`` on multi-year ranges and large
+duration multipliers.
+
+Usage:
+    python -m benchmarks.date_utils [--years 30] [--factor 1000000]
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from utils.dates import HolidayCalendar, business_days_between, iter_days, multiply_duration
+
+
+def legacy_business_days(start: date, end: date, holidays: set) -> int:
+    """Day-by-day loop, as ``valida_dias_uteis_mes`` used to do."""
+    count = 0
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        if day.weekday() not in [6, 5] and day not in holidays:
+            count += 1
+    return count
+
+
+def legacy_days_in_range(start: date, end: date) -> list:
+    """Materialized list of every day, as ``days_in_range`` used to return."""
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def legacy_multiply_time(time_str: str, multiply_factor: int) -> str:
+    """Re-parse one copy of the string per unit of the factor."""
+    lines = [time_str] * int(multiply_factor)
+    total = 0
+    for line in lines:
+        h, m, s = map(int, line.split(":"))
+        total += 3600 * h + 60 * m + s
+    return "%02d:%02d:%02d" % (total / 3600, total / 60 % 60, total % 60)
+
+
+def timed(func, *args, repeat: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, (time.perf_counter() - started) / repeat
+
+
+def report(name: str, legacy, current):
+    (legacy_result, legacy_time), (current_result, current_time) = legacy, current
+    status = "ok" if legacy_result == current_result else f"MISMATCH ({legacy_result} != {current_result})"
+    speedup = legacy_time / current_time if current_time else float("inf")
+    print(f"{name:<32} legacy {legacy_time * 1000:10.3f} ms   new {current_time * 1000:10.4f} ms   {speedup:10.1f}x   {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--factor", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    start = date(2000, 1, 1)
+    end = start + timedelta(days=365 * args.years)
+    holidays = [date(year, month, day) for year in range(start.year, end.year + 1) for month, day in ((1, 1), (5, 1), (12, 25))]
+    calendar = HolidayCalendar(holidays)
+
+    print(f"Range {start} .. {end} ({(end - start).days + 1} days), {len(holidays)} holidays, factor {args.factor}\n")
+
+    report(
+        "business days",
+        timed(legacy_business_days, start, end, set(holidays)),
+        timed(business_days_between, start, end, calendar, repeat=1000)
+    )
+    report(
+        "days in range (first 10)",
+        timed(lambda: legacy_days_in_range(start, end)[:10]),
+        timed(lambda: [day for _, day in zip(range(10), iter_days(start, end))], repeat=1000)
+    )
+    report(
+        "multiply time",
+        timed(legacy_multiply_time, "01:30:15", args.factor),
+        timed(multiply_duration, "01:30:15", args.factor, repeat=1000)
+    )
+
+
+if __name__ == "__main__":
+    main()
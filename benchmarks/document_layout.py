@@ -0,0 +1,74 @@
+"""
+Document Layout Benchmark
+
+Compares the size of agent logs stored with the verbose and the compact
+document layouts: BSON bytes per document and, when MONGODB_URI is set, the
+collection storage and index sizes reported by ``collStats``.
+
+Usage:
+    python -m benchmarks.document_layout [--rows 20000]
+
+The MongoDB run writes to temporary logs, latency sketch and daily rollup
+collections that are dropped after each layout.
+"""
+
+import argparse
+import os
+import bson
+
+os.environ["MONGODB_COLLECTION_AGENTS_LOGS"] = "agents_logs_benchmark"
+os.environ["MONGODB_COLLECTION_AGENTS_LATENCY_SKETCHES"] = "agents_logs_latency_sketches_benchmark"
+os.environ["MONGODB_COLLECTION_AGENTS_DAILY_ROLLUPS"] = "agents_logs_daily_rollups_benchmark"
+
+from benchmarks.storage_backends import drop_collections, make_entries  # noqa: E402
+from database.layout import COMPACT_LAYOUT, VERBOSE_LAYOUT  # noqa: E402
+
+LAYOUTS = (("verbose", VERBOSE_LAYOUT), ("compact", COMPACT_LAYOUT))
+
+
+def bson_sizes(entries):
+    print(f"{'layout':<8} {'bson bytes/doc':>15}")
+    baseline = None
+    for name, layout in LAYOUTS:
+        average = sum(len(bson.encode(layout.encode(dict(entry)))) for entry in entries) / len(entries)
+        baseline = baseline or average
+        print(f"{name:<8} {average:>15.1f}   {average / baseline:6.1%}")
+
+
+def mongodb_sizes(entries):
+    from pymongo import MongoClient
+    from database.repository.agents_logs import AgentsLogsRepository
+
+    client = MongoClient(os.environ["MONGODB_URI"])
+    database = client[os.environ.get("MONGODB_DATABASE", "benchmark")]
+
+    print(f"\n{'layout':<8} {'storage MB':>12} {'indexes MB':>12} {'avg obj':>10}")
+    for name, layout in LAYOUTS:
+        repository = AgentsLogsRepository(db=database, layout=layout)
+        try:
+            repository.insert_logs([dict(entry) for entry in entries])
+            stats = database.command("collStats", repository.collection.name)
+            print(
+                f"{name:<8} {stats['storageSize'] / 2**20:>12.2f} "
+                f"{stats['totalIndexSize'] / 2**20:>12.2f} {stats.get('avgObjSize', 0):>10.0f}"
+            )
+        finally:
+            drop_collections(repository)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    entries = list(make_entries(args.rows))
+    bson_sizes(entries)
+
+    if os.environ.get("MONGODB_URI"):
+        mongodb_sizes(entries)
+    else:
+        print("\nmongodb  skipped (MONGODB_URI not set)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Storage Backends Benchmark
+
+Compares the MongoDB and SQLite agents logs repositories on inserts,
+filtered/sorted reads and grouped statistics.
+
+Usage:
+    python -m benchmarks.storage_backends [--rows 20000]
+
+The MongoDB run is skipped when MONGODB_URI is not set. It writes to
+temporary logs, latency sketch and daily rollup collections that are
+dropped at the end.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix="mcp-bench-")
+os.environ.setdefault("LOG_PATH", TMP_DIR)
+os.environ["MONGODB_COLLECTION_AGENTS_LOGS"] = "agents_logs_benchmark"
+os.environ["MONGODB_COLLECTION_AGENTS_LATENCY_SKETCHES"] = "agents_logs_latency_sketches_benchmark"
+os.environ["MONGODB_COLLECTION_AGENTS_DAILY_ROLLUPS"] = "agents_logs_daily_rollups_benchmark"
+
+from database.connection.sqlite import SQLiteConnection  # noqa: E402
+from database.repository.agents_logs_sqlite import SQLiteAgentsLogsRepository  # noqa: E402
+
+PROJECTS = [f"project_{i}" for i in range(5)]
+AGENTS = [f"agent_{i}" for i in range(20)]
+INTERACTION_TYPES = ["chat", "task", "query"]
+STATUSES = ["completed", "failed", None]
+
+
+def make_entries(rows: int):
+    start = datetime(2024, 1, 1)
+    random.seed(42)
+    for i in range(rows):
+        timestamp = start + timedelta(seconds=i * 30)
+        entry = {
+            "project_name": random.choice(PROJECTS),
+            "agent_name": random.choice(AGENTS),
+            "interaction_type": random.choice(INTERACTION_TYPES),
+            "user_input": "How can I reset my password?",
+            "agent_response": "You can reset your password by clicking...",
+            "metadata": {"user_id": str(random.randint(1, 1000))},
+            "session_id": f"session_{random.randint(1, 5000)}",
+            "timestamp": timestamp,
+            "created_at": timestamp,
+        }
+        status = random.choice(STATUSES)
+        if status:
+            entry["status"] = status
+            entry["execution_time_ms"] = random.uniform(50, 5000)
+        yield entry
+
+
+def drop_collections(repository):
+    """Drop the temporary collections written by a MongoDB run."""
+    repository.collection.drop()
+    repository.latency_sketches.drop()
+    repository.daily_rollups.drop()
+
+
+def run(name: str, repository, rows: int):
+    entries = list(make_entries(rows))
+
+    started = time.perf_counter()
+    for entry in entries:
+        repository.insert_log(dict(entry))
+    if hasattr(repository, "flush"):
+        repository.flush()
+    insert_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for agent in AGENTS:
+        repository.find_logs(project_name=PROJECTS[0], agent_name=agent, limit=100)
+    find_s = (time.perf_counter() - started) / len(AGENTS)
+
+    started = time.perf_counter()
+    for agent in AGENTS:
+        repository.get_statistics(project_name=PROJECTS[0], agent_name=agent)
+    stats_s = (time.perf_counter() - started) / len(AGENTS)
+
+    print(
+        f"{name:<8} insert {rows / insert_s:>10.0f} rows/s | "
+        f"find {find_s * 1000:>8.2f} ms | statistics {stats_s * 1000:>8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    connection = SQLiteConnection(os.path.join(TMP_DIR, "benchmark.db")).connect()
+    run("sqlite", SQLiteAgentsLogsRepository(connection=connection), args.rows)
+
+    if os.environ.get("MONGODB_URI"):
+        from pymongo import MongoClient
+        from database.repository.agents_logs import AgentsLogsRepository
+
+        client = MongoClient(os.environ["MONGODB_URI"])
+        database = client[os.environ.get("MONGODB_DATABASE", "benchmark")]
+        repository = AgentsLogsRepository(db=database)
+        try:
+            run("mongodb", repository, args.rows)
+        finally:
+            drop_collections(repository)
+    else:
+        print("mongodb  skipped (MONGODB_URI not set)")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,16 +19,69 @@ class EnvVariables:
     MCP_HOST = environ.get('MCP_HOST', "localhost")
     MCP_PORT = environ.get('MCP_PORT', 2000)
     MCP_API_KEY = environ.get('MCP_API_KEY')
+    MCP_ADMIN_API_KEY = environ.get('MCP_ADMIN_API_KEY')
 
     #   Diretórios
     BASE_PATH = environ.get('BASE_PATH')
     LOG_PATH = environ.get('LOG_PATH')
+    ARCHIVE_PATH = environ.get('ARCHIVE_PATH', 'archive')
+    EXPORT_PATH = environ.get('EXPORT_PATH', 'exports')
     
+    #   Storage backend (mongodb | sqlite)
+    STORAGE_BACKEND = environ.get('STORAGE_BACKEND', 'mongodb').lower()
+
     #   Connections databases
     MONGODB_URI = environ.get('MONGODB_URI')
+    MONGODB_ANALYTICS_URI = environ.get('MONGODB_ANALYTICS_URI', MONGODB_URI)
+    SQLITE_PATH = environ.get('SQLITE_PATH', 'agents_logs.db')
+    SQLITE_BATCH_SIZE = int(environ.get('SQLITE_BATCH_SIZE', 100))
+    SQLITE_FLUSH_INTERVAL_SECONDS = float(environ.get('SQLITE_FLUSH_INTERVAL_SECONDS', 1.0))
 
     #   Databases
     MONGODB_DATABASE = environ.get('MONGODB_DATABASE')
 
     #   Collections/Tables
-    MONGODB_COLLECTION_AGENTS_LOGS = environ.get('MONGODB_COLLECTION_AGENTS_LOGS')
\ No newline at end of file
+    MONGODB_COLLECTION_AGENTS_LOGS = environ.get('MONGODB_COLLECTION_AGENTS_LOGS')
+    MONGODB_COLLECTION_AGENTS_LATENCY_SKETCHES = environ.get(
+        'MONGODB_COLLECTION_AGENTS_LATENCY_SKETCHES', 'agents_logs_latency_sketches'
+    )
+    MONGODB_COLLECTION_AGENTS_DAILY_ROLLUPS = environ.get(
+        'MONGODB_COLLECTION_AGENTS_DAILY_ROLLUPS', 'agents_logs_daily_rollups'
+    )
+    SQLITE_TABLE_AGENTS_LOGS = environ.get('SQLITE_TABLE_AGENTS_LOGS', 'agents_logs')
+
+    #   Document layout (chaves curtas e sem nulos no MongoDB)
+    COMPACT_LAYOUT = environ.get('COMPACT_LAYOUT', 'false').lower() in ('1', 'true', 'yes')
+
+    #   Analytics read path (get_agents_logs, get_agents_statistics, get_project_overview)
+    MONGODB_ANALYTICS_READ_PREFERENCE = environ.get('MONGODB_ANALYTICS_READ_PREFERENCE', 'secondaryPreferred')
+    MONGODB_ANALYTICS_MAX_STALENESS_SECONDS = int(environ.get('MONGODB_ANALYTICS_MAX_STALENESS_SECONDS', -1))
+    MONGODB_ANALYTICS_MAX_POOL_SIZE = int(environ.get('MONGODB_ANALYTICS_MAX_POOL_SIZE', 10))
+    ANALYTICS_MAX_TIME_MS = int(environ.get('ANALYTICS_MAX_TIME_MS', 30000))
+
+    #   Statistics
+    LATENCY_SKETCH_RELATIVE_ACCURACY = float(environ.get('LATENCY_SKETCH_RELATIVE_ACCURACY', 0.01))
+    HLL_PRECISION = int(environ.get('HLL_PRECISION', 12))
+
+    #   Retention (0 desativa o arquivamento)
+    RETENTION_DAYS = int(environ.get('RETENTION_DAYS', 0))
+    RETENTION_INTERVAL_SECONDS = float(environ.get('RETENTION_INTERVAL_SECONDS', 3600))
+    RETENTION_BATCH_SIZE = int(environ.get('RETENTION_BATCH_SIZE', 1000))
+
+    #   Profiling
+    PROFILING_ENABLED = environ.get('PROFILING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    PROFILING_SAMPLE_RATE = float(environ.get('PROFILING_SAMPLE_RATE', 0.01))
+    PROFILING_SAMPLER_INTERVAL_MS = float(environ.get('PROFILING_SAMPLER_INTERVAL_MS', 5))
+    PROFILING_MAX_BYTES = int(environ.get('PROFILING_MAX_BYTES', 50_000_000))
+
+    #   Export
+    EXPORT_BATCH_SIZE = int(environ.get('EXPORT_BATCH_SIZE', 1000))
+
+    #   Cacheable resources (agents-stats://, agents-logs://)
+    RESOURCE_CACHE_SIZE = int(environ.get('RESOURCE_CACHE_SIZE', 1024))
+    RESOURCE_DAY_LOGS_LIMIT = int(environ.get('RESOURCE_DAY_LOGS_LIMIT', 1000))
+    RESOURCE_CLOSED_DAY_GRACE_SECONDS = float(environ.get('RESOURCE_CLOSED_DAY_GRACE_SECONDS', 3600))
+
+    #   Live tail
+    LIVE_TAIL_BUFFER_SIZE = int(environ.get('LIVE_TAIL_BUFFER_SIZE', 500))
+    LIVE_TAIL_RETRY_SECONDS = float(environ.get('LIVE_TAIL_RETRY_SECONDS', 5))
@@ -1,3 +1,4 @@
+from mcp import types
 from mcp.server.fastmcp import FastMCP
 from mcp.server.auth.settings import AuthSettings
 from pydantic import AnyHttpUrl
@@ -40,6 +41,25 @@ def create_mcp_server() -> FastMCP:
         auth=auth_settings,
         token_verifier=token_verifier
     )
+    advertise_resource_subscriptions(mcp)
     
     logger.info(f"MCP server '{EnvVariables.MCP_SERVER_NAME}' configured successfully")
     return mcp
+
+
+def advertise_resource_subscriptions(mcp: FastMCP):
+    """Announce ``resources.subscribe`` once a subscribe handler is registered.
+
+    The low-level server always reports ``subscribe=False``, so clients that
+    follow the spec would never send ``resources/subscribe``.
+    """
+    server = mcp._mcp_server
+    get_capabilities = server.get_capabilities
+
+    def get_capabilities_with_subscribe(*args, **kwargs) -> types.ServerCapabilities:
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None and types.SubscribeRequest in server.request_handlers:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities_with_subscribe
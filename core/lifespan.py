@@ -3,6 +3,7 @@ from collections.abc import AsyncIterator
 from mcp.server.fastmcp import FastMCP
 from config.env_variables import EnvVariables
 from logs.logging import get_logger
+from logs.agents import agents_logger
 
 logger = get_logger("lifespan")
 
@@ -23,6 +24,8 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[None]:
     
     # Antes do yield: executa o que deve acontecer quando o servidor inicia 
     # (exemplo: conectar ao banco, carregar cache, inicializar serviços).
+    agents_logger.retention.start()
+    
     try:
         yield
     finally:
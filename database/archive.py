@@ -0,0 +1,137 @@
+"""
+Agents Logs Archive Module
+
+Date-partitioned, gzip-compressed NDJSON archive of agent logs that left the
+hot window of the database. Each day is one file
+(``<ARCHIVE_PATH>/YYYY/MM/YYYY-MM-DD.ndjson.gz``), so a date-range query only
+opens the partitions it needs.
+"""
+
+import gzip
+import heapq
+import json
+import os
+import zlib
+from datetime import date, datetime
+from glob import glob
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from config.env_variables import EnvVariables
+from logs.logging import get_logger
+
+logger = get_logger("agents_logs_archive")
+
+PARTITION_SUFFIX = ".ndjson.gz"
+
+
+def log_key(document: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Identity of a serialized log entry across the database and the archive."""
+    return document["_id"], document["timestamp"]
+
+
+class LogArchive:
+    """Reads and appends archived agent log partitions."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or EnvVariables.ARCHIVE_PATH
+
+    def partition_path(self, day: date) -> str:
+        return os.path.join(self.path, f"{day:%Y}", f"{day:%m}", f"{day:%Y-%m-%d}{PARTITION_SUFFIX}")
+
+    def append(self, day: date, documents: Iterable[Dict[str, Any]]) -> int:
+        """Append serialized documents to the partition of ``day``.
+
+        Each call adds a new gzip member, which readers see as one continuous
+        stream, so partitions never need to be rewritten.
+        """
+        path = self.partition_path(day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        written = 0
+        with gzip.open(path, "at", encoding="utf-8") as partition:
+            for document in documents:
+                partition.write(json.dumps(document, separators=(",", ":")) + "\n")
+                written += 1
+        return written
+
+    def available_days(self) -> List[date]:
+        """Days that have a partition on disk, oldest first."""
+        days = []
+        for path in glob(os.path.join(self.path, "*", "*", f"*{PARTITION_SUFFIX}")):
+            name = os.path.basename(path)[:-len(PARTITION_SUFFIX)]
+            try:
+                days.append(date.fromisoformat(name))
+            except ValueError:
+                continue
+        return sorted(days)
+
+    def read_partition(self, day: date) -> Iterator[Dict[str, Any]]:
+        """Stream the documents of one partition."""
+        path = self.partition_path(day)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as partition:
+                for line in partition:
+                    yield json.loads(line)
+        except FileNotFoundError:
+            return
+        except (EOFError, zlib.error, json.JSONDecodeError) as e:
+            # Último append interrompido no meio: o que veio antes continua válido
+            logger.warning(f"Archive partition {path} is truncated, ignoring the rest of it: {e}")
+
+    def find_logs(
+        self,
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        exclude_keys: Optional[Set[Tuple[Any, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the newest archived entries matching the filters.
+
+        Partitions are read newest first and reading stops as soon as
+        ``limit`` entries were found, so only the needed files are opened.
+        Entries whose ``(_id, timestamp)`` is in ``exclude_keys`` or was
+        already returned (an interrupted archive run can append a batch
+        twice) are skipped. The timestamp is part of the key because SQLite
+        reuses row ids once retention empties the table.
+        """
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        first_day = start_date.date() if start_date else None
+        last_day = end_date.date() if end_date else None
+        seen_keys = set(exclude_keys or ())
+
+        results: List[Dict[str, Any]] = []
+        for day in reversed(self.available_days()):
+            if len(results) >= limit or (first_day and day < first_day):
+                break
+            if last_day and day > last_day:
+                continue
+
+            matches = heapq.nlargest(
+                limit - len(results),
+                self._unique(
+                    (
+                        document for document in self.read_partition(day)
+                        if (not project_name or document.get("project_name") == project_name)
+                        and (not agent_name or document.get("agent_name") == agent_name)
+                        and (not session_id or document.get("session_id") == session_id)
+                        and (not start or document["timestamp"] >= start)
+                        and (not end or document["timestamp"] <= end)
+                    ),
+                    seen_keys
+                ),
+                key=lambda document: document["timestamp"]
+            )
+            results.extend(matches)
+
+        return results
+
+    @staticmethod
+    def _unique(documents: Iterable[Dict[str, Any]], seen_keys: Set[Tuple[Any, Any]]) -> Iterator[Dict[str, Any]]:
+        for document in documents:
+            key = log_key(document)
+            if key not in seen_keys:
+                seen_keys.add(key)
+                yield document
@@ -15,12 +15,13 @@ logger = get_logger("mongodb_config")
 class MongoDBConnection:
     """MongoDB connection manager."""
     
-    def __init__(self):
-        self.uri = EnvVariables.MONGODB_URI
+    def __init__(self, uri: str | None = None, **client_options):
+        self.uri = uri or EnvVariables.MONGODB_URI
+        self.client_options = client_options
 
     def connect(self):
         """Establish connection to MongoDB."""
-        self._client = MongoClient(self.uri)
+        self._client = MongoClient(self.uri, **self.client_options)
 
         try:
             self._client.admin.command('ping')
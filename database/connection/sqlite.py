@@ -0,0 +1,46 @@
+"""
+SQLite Configuration Module
+
+Handles the embedded SQLite connection used by edge and single-node deployments.
+"""
+
+import sqlite3
+from urllib.request import pathname2url
+from config.env_variables import EnvVariables
+from logs.logging import get_logger
+
+logger = get_logger("sqlite_config")
+
+
+class SQLiteConnection:
+    """SQLite connection manager."""
+
+    def __init__(self, path: str | None = None, read_only: bool = False):
+        self.path = path or EnvVariables.SQLITE_PATH
+        self.read_only = read_only
+
+    def connect(self):
+        """Open the database file in WAL mode.
+
+        WAL lets readers run concurrently with the single writer, and
+        ``synchronous=NORMAL`` is durable across application crashes while
+        avoiding an fsync on every commit. Read-only connections serve the
+        analytics queries without contending for the writer connection.
+        """
+        if self.read_only:
+            self._connection = sqlite3.connect(
+                f"file:{pathname2url(self.path)}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA query_only=ON")
+        else:
+            self._connection = sqlite3.connect(
+                self.path,
+                check_same_thread=False,
+                isolation_level=None  # Transações explícitas (BEGIN/COMMIT) nos repositories
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA temp_store=MEMORY")
+        logger.info(f"Opened SQLite database at {self.path}{' (read-only)' if self.read_only else ''}")
+
+        return self._connection
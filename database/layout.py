@@ -0,0 +1,110 @@
+"""
+Agents Logs Document Layout Module
+
+Maps agent log entries between the shape used by the application (and
+returned by the tools) and the shape stored in MongoDB.
+
+The verbose layout stores entries as they are. The compact layout
+(``COMPACT_LAYOUT=true``) shortens every key, omits null and empty fields,
+stores the well-known ``interaction_type`` values as small integers and
+keeps a single time field. ``created_at`` is recovered from the ``_id``,
+whose ObjectId already carries the insertion time.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from bson import ObjectId
+from config.env_variables import EnvVariables
+
+# Campos lógicos -> chaves gravadas no layout compacto
+COMPACT_FIELDS = {
+    "project_name": "p",
+    "agent_name": "a",
+    "interaction_type": "t",
+    "user_input": "u",
+    "agent_response": "r",
+    "metadata": "m",
+    "session_id": "s",
+    "status": "st",
+    "execution_time_ms": "e",
+    "timestamp": "ts",
+    "event_id": "ev",
+}
+
+# Tipos de interação conhecidos gravados como inteiros; os demais ficam como texto
+INTERACTION_TYPE_CODES = {"chat": 1, "task": 2, "query": 3}
+INTERACTION_TYPE_NAMES = {code: name for name, code in INTERACTION_TYPE_CODES.items()}
+
+# Campos que o formato atual sempre traz, mesmo vazios
+ALWAYS_PRESENT = ("user_input", "agent_response", "metadata", "session_id")
+
+
+class DocumentLayout:
+    """Field names and encoding of the stored agent log documents."""
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.fields = COMPACT_FIELDS if compact else {name: name for name in COMPACT_FIELDS}
+
+    def field(self, name: str) -> str:
+        """Stored key of a logical field."""
+        return self.fields[name]
+
+    def encode_interaction_type(self, value: Any) -> Any:
+        if not self.compact:
+            return value
+        return INTERACTION_TYPE_CODES.get(value, value)
+
+    def decode_interaction_type(self, value: Any) -> Any:
+        return INTERACTION_TYPE_NAMES.get(value, value) if isinstance(value, int) else value
+
+    def encode(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Document to store for a log entry (the entry itself in the verbose layout)."""
+        if not self.compact:
+            return entry
+
+        document = {"_id": entry["_id"]} if "_id" in entry else {}
+        for name, key in self.fields.items():
+            value = entry.get(name)
+            if value is None or value == {}:
+                continue
+            document[key] = self.encode_interaction_type(value) if name == "interaction_type" else value
+        return document
+
+    def decode(self, document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Log entry in the application shape, whichever layout ``document`` was stored with."""
+        if not document or "project_name" in document:
+            return document
+
+        entry = {"_id": document["_id"]} if "_id" in document else {}
+        for name in ("project_name", "agent_name", "interaction_type", "user_input", "agent_response", "metadata", "session_id"):
+            key = COMPACT_FIELDS[name]
+            if key in document:
+                entry[name] = document[key]
+            elif name in ALWAYS_PRESENT:
+                entry[name] = {} if name == "metadata" else None
+        if "interaction_type" in entry:
+            entry["interaction_type"] = self.decode_interaction_type(entry["interaction_type"])
+
+        entry["timestamp"] = document.get(COMPACT_FIELDS["timestamp"])
+        entry["created_at"] = created_at(document.get("_id"), entry["timestamp"])
+        for name in ("status", "execution_time_ms", "event_id"):
+            key = COMPACT_FIELDS[name]
+            if key in document:
+                entry[name] = document[key]
+        return entry
+
+
+def created_at(document_id: Any, fallback: Optional[datetime]) -> Optional[datetime]:
+    """Insertion time embedded in an ObjectId, in local time like ``datetime.now()``."""
+    if isinstance(document_id, ObjectId):
+        return document_id.generation_time.astimezone().replace(tzinfo=None)
+    return fallback
+
+
+VERBOSE_LAYOUT = DocumentLayout(compact=False)
+COMPACT_LAYOUT = DocumentLayout(compact=True)
+
+
+def configured_layout() -> DocumentLayout:
+    return COMPACT_LAYOUT if EnvVariables.COMPACT_LAYOUT else VERBOSE_LAYOUT
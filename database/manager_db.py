@@ -11,4 +11,17 @@ class ManagerMongoDB:
 
    mongo_database = mongo_client[EnvVariables.MONGODB_DATABASE]
 
-   agents_logs_repository = AgentsLogsRepository(db=mongo_database)
+   # Client separado para as consultas analíticas: lê de secundários e tem
+   # pool próprio, para não competir com a ingestão no primário
+   analytics_client = MongoDBConnection(
+      uri=EnvVariables.MONGODB_ANALYTICS_URI,
+      readPreference=EnvVariables.MONGODB_ANALYTICS_READ_PREFERENCE,
+      maxStalenessSeconds=EnvVariables.MONGODB_ANALYTICS_MAX_STALENESS_SECONDS,
+      maxPoolSize=EnvVariables.MONGODB_ANALYTICS_MAX_POOL_SIZE,
+      appname=f"{EnvVariables.MCP_SERVER_NAME}-analytics"
+   )
+   analytics_client = analytics_client.connect()
+
+   analytics_database = analytics_client[EnvVariables.MONGODB_DATABASE]
+
+   agents_logs_repository = AgentsLogsRepository(db=mongo_database, analytics_db=analytics_database)
@@ -0,0 +1,18 @@
+from database.repository.agents_logs_sqlite import SQLiteAgentsLogsRepository
+from database.connection.sqlite import SQLiteConnection
+
+class ManagerSQLite:
+   """
+   ManagerSQLite é a classe que gerencia as operações do banco SQLite embarcado.
+   """ 
+   sqlite_connection = SQLiteConnection()
+   sqlite_connection = sqlite_connection.connect()
+
+   # Conexão somente leitura para as consultas analíticas (WAL permite leituras concorrentes)
+   sqlite_read_connection = SQLiteConnection(read_only=True)
+   sqlite_read_connection = sqlite_read_connection.connect()
+
+   agents_logs_repository = SQLiteAgentsLogsRepository(
+      connection=sqlite_connection,
+      read_connection=sqlite_read_connection
+   )
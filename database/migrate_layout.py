@@ -0,0 +1,137 @@
+"""
+Agents Logs Layout Migration
+
+Rewrites the stored agent logs between the verbose and the compact document
+layouts (see ``database.layout``). Documents are converted in ``_id`` order,
+one batch at a time, and only those still in the other layout are touched,
+so the command can be interrupted and run again at any point.
+
+Procedure (MongoDB only; the SQLite backend is already columnar):
+    1. python -m database.migrate_layout --to compact
+    2. set COMPACT_LAYOUT=true and restart the server
+    3. python -m database.migrate_layout --to compact --drop-old-indexes
+       (converts entries written between steps 1 and 2)
+
+Between steps 1 and 2 the running server only sees documents in its own
+layout, so reads and statistics miss the entries already converted, and a
+retried ``event_id`` whose first copy was converted is stored again. The
+next run deletes those duplicates instead of converting them and reports
+how many were removed. Keep the window short, or stop ingestion during it.
+
+Usage:
+    python -m database.migrate_layout --to compact|verbose [--batch-size 1000] [--dry-run] [--drop-old-indexes]
+"""
+
+import argparse
+from typing import Any, Dict, Optional, Tuple
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+from config.env_variables import EnvVariables
+from database.connection.mongodb import MongoDBConnection
+from database.layout import COMPACT_LAYOUT, VERBOSE_LAYOUT, DocumentLayout
+from database.repository.agents_logs import DUPLICATE_KEY_ERROR, AgentsLogsRepository
+from logs.logging import get_logger
+
+logger = get_logger("migrate_layout")
+
+
+def convert_document(document: Dict[str, Any], target: DocumentLayout) -> Dict[str, Any]:
+    """Stored document rewritten in the ``target`` layout, keeping its ``_id``."""
+    entry = COMPACT_LAYOUT.decode(document)
+    if not target.compact:
+        return entry
+    return target.encode(entry)
+
+
+def migrate(collection, target: DocumentLayout, batch_size: int = 1000, dry_run: bool = False) -> Tuple[int, int]:
+    """Convert every document of ``collection`` still in the other layout.
+
+    A document whose ``event_id`` already exists in the target layout is a
+    retry stored during the migration window and is deleted.
+
+    Returns:
+        Tuple[int, int]: Documents converted (or to be converted on a dry
+        run) and duplicates deleted.
+    """
+    source = VERBOSE_LAYOUT if target.compact else COMPACT_LAYOUT
+    query = {source.field("project_name"): {"$exists": True}}
+
+    if dry_run:
+        return collection.count_documents(query), 0
+
+    converted = 0
+    duplicates = 0
+    last_id: Optional[Any] = None
+    while True:
+        batch_query = {**query, "_id": {"$gt": last_id}} if last_id is not None else query
+        documents = list(collection.find(batch_query).sort("_id", 1).limit(batch_size))
+        if not documents:
+            break
+
+        # O filtro pela chave de origem evita reescrever um documento já convertido em paralelo
+        try:
+            result = collection.bulk_write([
+                ReplaceOne({"_id": document["_id"], **query}, convert_document(document, target))
+                for document in documents
+            ], ordered=False)
+            converted += result.modified_count
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            unexpected = [error for error in errors if error.get("code") != DUPLICATE_KEY_ERROR]
+            if unexpected:
+                raise
+            converted += e.details.get("nModified", 0)
+
+            # Reenvio de um event_id já convertido: a cópia no layout antigo é descartada
+            duplicate_ids = [documents[error["index"]]["_id"] for error in errors]
+            duplicates += collection.delete_many({"_id": {"$in": duplicate_ids}, **query}).deleted_count
+            logger.warning(f"Deleted {len(duplicate_ids)} agent logs whose event_id was already migrated")
+
+        last_id = documents[-1]["_id"]
+        logger.info(f"Converted {converted} agent logs (last _id {last_id})")
+
+    return converted, duplicates
+
+
+def drop_source_indexes(collection, target: DocumentLayout) -> list:
+    """Drop the indexes built on the field names of the other layout."""
+    source = VERBOSE_LAYOUT if target.compact else COMPACT_LAYOUT
+    source_keys = set(source.fields.values())
+
+    dropped = []
+    for name, info in collection.index_information().items():
+        if name != "_id_" and any(key in source_keys for key, _ in info["key"]):
+            collection.drop_index(name)
+            dropped.append(name)
+    return dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--to", choices=("compact", "verbose"), required=True)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--drop-old-indexes", action="store_true")
+    args = parser.parse_args()
+
+    target = COMPACT_LAYOUT if args.to == "compact" else VERBOSE_LAYOUT
+    client = MongoDBConnection().connect()
+    repository = AgentsLogsRepository(db=client[EnvVariables.MONGODB_DATABASE], layout=target)
+
+    if args.dry_run:
+        pending, _ = migrate(repository.collection, target, dry_run=True)
+        print(f"{pending} agent logs to convert to the {args.to} layout")
+        return
+
+    # Índices do layout de destino antes da conversão, para a chave de idempotência valer desde o início
+    repository.ensure_indexes()
+    converted, duplicates = migrate(repository.collection, target, batch_size=args.batch_size)
+    print(f"Converted {converted} agent logs to the {args.to} layout, deleted {duplicates} duplicates")
+
+    if args.drop_old_indexes:
+        dropped = drop_source_indexes(repository.collection, target)
+        print(f"Dropped indexes: {', '.join(dropped) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,517 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from .repository import Repository
 from config.env_variables import EnvVariables
+from database.layout import DocumentLayout, configured_layout
+from utils.ddsketch import DDSketch
+from utils.hyperloglog import HyperLogLog
+
+
+# Código de erro do MongoDB para violação de índice único
+DUPLICATE_KEY_ERROR = 11000
+
+
+def build_period_filter(start_date: Optional[datetime], end_date: Optional[datetime]) -> Dict[str, Any]:
+    """Build a MongoDB ``$gte``/``$lte`` range filter for a date field."""
+    period = {}
+    if start_date:
+        period["$gte"] = start_date
+    if end_date:
+        period["$lte"] = end_date
+    return period
+
+
+def latency_bucket(timestamp: datetime) -> datetime:
+    """Start of the hourly bucket that holds the latency sketch for ``timestamp``."""
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(timestamp: datetime) -> datetime:
+    """Start of the day that holds the daily rollup for ``timestamp``."""
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def distinct_values(entry: Dict[str, Any]) -> Dict[str, str]:
+    """Values counted by the daily HyperLogLog sketches, keyed by sketch name."""
+    values = {}
+    if entry.get("session_id"):
+        values["sessions"] = str(entry["session_id"])
+    user_id = (entry.get("metadata") or {}).get("user_id")
+    if user_id is not None:
+        values["users"] = str(user_id)
+    return values
+
+
+def merge_distinct_registers(records: List[Tuple[str, int, int, int]], precision: int) -> Dict[str, int]:
+    """Estimate distinct counts from ``(name, precision, index, rank)`` records.
+
+    Registers stored with different precisions are folded to the lowest one.
+    """
+    target = min([precision] + [record[1] for record in records])
+    sketches = {"sessions": HyperLogLog(target), "users": HyperLogLog(target)}
+    for name, record_precision, index, rank in records:
+        sketches[name].add_registers([(index, rank)], record_precision)
+    return {name: sketch.count() for name, sketch in sketches.items()}
+
+
+# Campos aceitos para ordenar o overview de projeto
+OVERVIEW_SORT_FIELDS = ("total_interactions", "average_execution_time_ms", "agent_name")
+
+
+def build_agent_overview(rows: Iterable[Tuple[Any, Any, Any, int, float, int]]) -> Dict[str, Dict[str, Any]]:
+    """Fold ``(agent, interaction_type, status, count, time_sum, time_count)`` groups into per-agent summaries."""
+    agents: Dict[str, Dict[str, Any]] = {}
+    totals: Dict[str, List[float]] = {}
+
+    for agent_name, interaction_type, status, count, time_sum, time_count in rows:
+        agent = agents.get(agent_name)
+        if agent is None:
+            agent = agents[agent_name] = {
+                "agent_name": agent_name,
+                "total_interactions": 0,
+                "interaction_types": {},
+                "task_statuses": {},
+                "average_execution_time_ms": None
+            }
+            totals[agent_name] = [0.0, 0]
+
+        agent["total_interactions"] += count
+        agent["interaction_types"][interaction_type] = agent["interaction_types"].get(interaction_type, 0) + count
+        if status is not None:
+            agent["task_statuses"][status] = agent["task_statuses"].get(status, 0) + count
+        if time_count:
+            totals[agent_name][0] += time_sum
+            totals[agent_name][1] += time_count
+
+    for agent_name, (time_sum, time_count) in totals.items():
+        if time_count:
+            agents[agent_name]["average_execution_time_ms"] = time_sum / time_count
+
+    return agents
+
+
+def sort_overview(
+    agents: Iterable[Dict[str, Any]],
+    sort_by: str,
+    descending: bool,
+    top_n: Optional[int]
+) -> List[Dict[str, Any]]:
+    """Order agent summaries like MongoDB does (missing values sort lowest) and keep the top N."""
+    ordered = sorted(
+        agents,
+        key=lambda agent: (agent[sort_by] is not None, agent[sort_by] or 0, agent["agent_name"]),
+        reverse=descending
+    )
+    return ordered[:top_n] if top_n else ordered
+
 
 class AgentsLogsRepository(Repository):
 
-    def __init__(self, db):
-        super(AgentsLogsRepository, self).__init__(db, collection_name=EnvVariables.MONGODB_COLLECTION_AGENTS_LOGS)
\ No newline at end of file
+    def __init__(self, db, analytics_db=None, layout: Optional[DocumentLayout] = None):
+        super(AgentsLogsRepository, self).__init__(db, collection_name=EnvVariables.MONGODB_COLLECTION_AGENTS_LOGS)
+        # Nomes dos campos gravados (layout verboso ou compacto); as entradas retornadas usam sempre os nomes completos
+        self.layout = layout or configured_layout()
+        self.latency_sketches = db.get_collection(EnvVariables.MONGODB_COLLECTION_AGENTS_LATENCY_SKETCHES)
+        self.latency_sketch = DDSketch(EnvVariables.LATENCY_SKETCH_RELATIVE_ACCURACY)
+        self.daily_rollups = db.get_collection(EnvVariables.MONGODB_COLLECTION_AGENTS_DAILY_ROLLUPS)
+        self.distinct_sketch = HyperLogLog(EnvVariables.HLL_PRECISION)
+        self._indexes_ready = False
+
+        # Consultas analíticas usam um client próprio (read preference, pool e maxTimeMS separados)
+        analytics_db = analytics_db if analytics_db is not None else db
+        self.analytics_collection = analytics_db.get_collection(EnvVariables.MONGODB_COLLECTION_AGENTS_LOGS)
+        self.analytics_latency_sketches = analytics_db.get_collection(EnvVariables.MONGODB_COLLECTION_AGENTS_LATENCY_SKETCHES)
+        self.analytics_daily_rollups = analytics_db.get_collection(EnvVariables.MONGODB_COLLECTION_AGENTS_DAILY_ROLLUPS)
+        self.max_time_ms = EnvVariables.ANALYTICS_MAX_TIME_MS
+
+    def ensure_indexes(self):
+        """Create the indexes on first write instead of at import time,
+        so a MongoDB outage does not block the server startup."""
+        if self._indexes_ready:
+            return
+        f = self.layout.field
+        self.collection.create_index(
+            [(f("project_name"), ASCENDING), (f("agent_name"), ASCENDING), (f("timestamp"), ASCENDING)]
+        )
+        self.collection.create_index([(f("project_name"), ASCENDING), (f("timestamp"), ASCENDING)])
+        self.collection.create_index([(f("timestamp"), ASCENDING)])
+        # Chave de idempotência: só entradas com event_id entram no índice
+        self.collection.create_index(
+            [(f("project_name"), ASCENDING), (f("event_id"), ASCENDING)],
+            unique=True,
+            partialFilterExpression={f("event_id"): {"$type": "string"}}
+        )
+        self.latency_sketches.create_index(
+            [("project_name", ASCENDING), ("agent_name", ASCENDING), ("bucket", ASCENDING), ("relative_accuracy", ASCENDING)],
+            unique=True
+        )
+        self.daily_rollups.create_index(
+            [("project_name", ASCENDING), ("agent_name", ASCENDING), ("day", ASCENDING), ("hll_precision", ASCENDING)],
+            unique=True
+        )
+        self._indexes_ready = True
+
+    def insert_log(self, entry: Dict[str, Any]) -> bool:
+        """Insert a single log entry.
+
+        Returns False when an entry with the same ``event_id`` already
+        exists; the retry is then a no-op and the rollups are left untouched.
+        """
+        self.ensure_indexes()
+        document = self.layout.encode(entry)
+        try:
+            self.collection.insert_one(document)
+        except DuplicateKeyError:
+            return False
+        entry.setdefault("_id", document["_id"])
+
+        if entry.get("execution_time_ms") is not None:
+            self.latency_sketches.update_one(*self._execution_time_update(entry), upsert=True)
+        self.daily_rollups.update_one(*self._daily_rollup_update(entry), upsert=True)
+
+        return True
+
+    def insert_logs(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert log entries in one unordered bulk write and return the ones stored.
+
+        Entries rejected only for a duplicate ``event_id`` are skipped; any
+        other write error is raised after the stored entries were counted in
+        the rollups.
+        """
+        if not entries:
+            return []
+
+        self.ensure_indexes()
+        documents = [self.layout.encode(entry) for entry in entries]
+        errors = []
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+        for entry, document in zip(entries, documents):
+            entry.setdefault("_id", document["_id"])
+
+        failed = {error["index"] for error in errors}
+        inserted = [entry for index, entry in enumerate(entries) if index not in failed]
+
+        latency_updates = [
+            UpdateOne(*self._execution_time_update(entry), upsert=True)
+            for entry in inserted if entry.get("execution_time_ms") is not None
+        ]
+        if latency_updates:
+            self.latency_sketches.bulk_write(latency_updates, ordered=False)
+        if inserted:
+            self.daily_rollups.bulk_write(
+                [UpdateOne(*self._daily_rollup_update(entry), upsert=True) for entry in inserted],
+                ordered=False
+            )
+
+        unexpected = [error for error in errors if error.get("code") != DUPLICATE_KEY_ERROR]
+        if unexpected:
+            raise BulkWriteError({"writeErrors": unexpected, "nInserted": len(inserted)})
+
+        return inserted
+
+    def _execution_time_update(self, entry: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Filter and update counting the execution time in the hourly DDSketch of the agent."""
+        key = self.latency_sketch.key(entry["execution_time_ms"])
+        counter = "zero_count" if key is None else f"bins.{key}"
+
+        return (
+            {
+                "project_name": entry["project_name"],
+                "agent_name": entry["agent_name"],
+                "bucket": latency_bucket(entry["timestamp"]),
+                "relative_accuracy": self.latency_sketch.relative_accuracy
+            },
+            {"$inc": {counter: 1, "count": 1}}
+        )
+
+    def _daily_rollup_update(self, entry: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Filter and update counting the write and raising the HyperLogLog registers of the agent's daily rollup."""
+        registers = {}
+        for name, value in distinct_values(entry).items():
+            index, rank = self.distinct_sketch.register(value)
+            registers[f"{name}.{index}"] = rank
+
+        update: Dict[str, Any] = {"$inc": {"writes": 1}}
+        if registers:
+            update["$max"] = registers
+
+        return (
+            {
+                "project_name": entry["project_name"],
+                "agent_name": entry["agent_name"],
+                "day": day_bucket(entry["timestamp"]),
+                "hll_precision": self.distinct_sketch.precision
+            },
+            update
+        )
+
+    def find_logs(
+        self,
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Return the newest log entries matching the filters."""
+        query = self._build_query(project_name, agent_name, session_id, start_date, end_date)
+
+        cursor = self.analytics_collection.find(query).sort(self.layout.field("timestamp"), -1).limit(limit).max_time_ms(self.max_time_ms)
+        return [self.layout.decode(document) for document in cursor]
+
+    def iter_log_batches(
+        self,
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream the entries matching the filters in ``_id`` order, one batch at a time.
+
+        Only one batch is held in memory, and ``after_id`` resumes right after
+        the last entry of a previous run. No ``maxTimeMS`` is set, since an
+        export is expected to outlive the analytics query limit.
+        """
+        query = self._build_query(project_name, agent_name, session_id, start_date, end_date)
+        if after_id:
+            query["_id"] = {"$gt": ObjectId(after_id)}
+
+        batch = []
+        for document in self.analytics_collection.find(query).sort("_id", ASCENDING).batch_size(batch_size):
+            batch.append(self.layout.decode(document))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _build_query(
+        self,
+        project_name: Optional[str],
+        agent_name: Optional[str],
+        session_id: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Dict[str, Any]:
+        f = self.layout.field
+        query = {}
+
+        if project_name:
+            query[f("project_name")] = project_name
+        if agent_name:
+            query[f("agent_name")] = agent_name
+        if session_id:
+            query[f("session_id")] = session_id
+        if start_date or end_date:
+            query[f("timestamp")] = build_period_filter(start_date, end_date)
+
+        return query
+
+    def get_statistics(
+        self,
+        project_name: str,
+        agent_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Aggregate interaction counts, statuses and average execution time."""
+        f = self.layout.field
+        query = self._build_query(project_name, agent_name, None, start_date, end_date)
+
+        # Count total interactions
+        total_interactions = self.analytics_collection.count_documents(query, maxTimeMS=self.max_time_ms)
+
+        # Count by interaction type
+        interaction_types = list(self.analytics_collection.aggregate([
+            {"$match": query},
+            {"$group": {"_id": f"${f('interaction_type')}", "count": {"$sum": 1}}}
+        ], maxTimeMS=self.max_time_ms))
+
+        # Count by status (for tasks)
+        task_statuses = list(self.analytics_collection.aggregate([
+            {"$match": {**query, f("status"): {"$exists": True}}},
+            {"$group": {"_id": f"${f('status')}", "count": {"$sum": 1}}}
+        ], maxTimeMS=self.max_time_ms))
+
+        # Get average execution time
+        avg_time_result = list(self.analytics_collection.aggregate([
+            {"$match": {**query, f("execution_time_ms"): {"$exists": True}}},
+            {"$group": {"_id": None, "avg_time": {"$avg": f"${f('execution_time_ms')}"}}}
+        ], maxTimeMS=self.max_time_ms))
+
+        return {
+            "total_interactions": total_interactions,
+            "interaction_types": {
+                self.layout.decode_interaction_type(item["_id"]): item["count"] for item in interaction_types
+            },
+            "task_statuses": {item["_id"]: item["count"] for item in task_statuses},
+            "average_execution_time_ms": avg_time_result[0]["avg_time"] if avg_time_result else None
+        }
+
+    def get_project_overview(
+        self,
+        project_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        sort_by: str = "total_interactions",
+        descending: bool = True,
+        top_n: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Summarize every agent of a project with a single aggregation.
+
+        The first ``$group`` counts each (agent, interaction type, status)
+        combination and the second folds them per agent, so sorting and the
+        top-N cut happen on the server.
+        """
+        f = self.layout.field
+        query = self._build_query(project_name, None, None, start_date, end_date)
+
+        sort_field = "_id" if sort_by == "agent_name" else sort_by
+        direction = -1 if descending else 1
+        pipeline = [
+            {"$match": query},
+            {"$group": {
+                "_id": {
+                    "agent": f"${f('agent_name')}",
+                    "type": f"${f('interaction_type')}",
+                    "status": f"${f('status')}"
+                },
+                "count": {"$sum": 1},
+                "time_sum": {"$sum": f"${f('execution_time_ms')}"},
+                "time_count": {"$sum": {"$cond": [{"$isNumber": f"${f('execution_time_ms')}"}, 1, 0]}}
+            }},
+            {"$group": {
+                "_id": "$_id.agent",
+                "total_interactions": {"$sum": "$count"},
+                "groups": {"$push": {
+                    "type": {"$ifNull": ["$_id.type", None]},
+                    "status": {"$ifNull": ["$_id.status", None]},
+                    "count": "$count",
+                    "time_sum": "$time_sum",
+                    "time_count": "$time_count"
+                }}
+            }},
+            {"$sort": {sort_field: direction, "_id": direction}}
+        ]
+        if sort_by == "average_execution_time_ms":
+            pipeline.insert(-1, {"$addFields": {"average_execution_time_ms": {"$let": {
+                "vars": {"time_count": {"$sum": "$groups.time_count"}},
+                "in": {"$cond": [
+                    {"$gt": ["$$time_count", 0]},
+                    {"$divide": [{"$sum": "$groups.time_sum"}, "$$time_count"]},
+                    None
+                ]}
+            }}}})
+        if top_n:
+            pipeline.append({"$limit": top_n})
+
+        agents = []
+        for document in self.analytics_collection.aggregate(pipeline, maxTimeMS=self.max_time_ms):
+            summary = build_agent_overview(
+                (
+                    document["_id"],
+                    self.layout.decode_interaction_type(group.get("type")),
+                    group.get("status"),
+                    group["count"],
+                    group["time_sum"],
+                    group["time_count"]
+                )
+                for group in document["groups"]
+            )
+            agents.extend(summary.values())
+
+        return agents
+
+    def get_execution_time_sketch(
+        self,
+        project_name: str,
+        agent_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> DDSketch:
+        """Merge the hourly latency sketches that overlap the period."""
+        query = {"project_name": project_name, "agent_name": agent_name}
+
+        if start_date or end_date:
+            query["bucket"] = build_period_filter(start_date and latency_bucket(start_date), end_date)
+
+        sketch = DDSketch(self.latency_sketch.relative_accuracy)
+        projection = {"bins": 1, "zero_count": 1, "relative_accuracy": 1}
+        for document in self.analytics_latency_sketches.find(query, projection).max_time_ms(self.max_time_ms):
+            sketch.add_bins(
+                ((int(key), count) for key, count in document.get("bins", {}).items()),
+                zero_count=document.get("zero_count", 0),
+                relative_accuracy=document["relative_accuracy"]
+            )
+
+        return sketch
+
+    def get_distinct_counts(
+        self,
+        project_name: str,
+        agent_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Estimate unique sessions and users by merging the daily HyperLogLog registers."""
+        query = {"project_name": project_name, "agent_name": agent_name}
+
+        if start_date or end_date:
+            query["day"] = build_period_filter(start_date and day_bucket(start_date), end_date)
+
+        records = []
+        projection = {"hll_precision": 1, "sessions": 1, "users": 1}
+        for document in self.analytics_daily_rollups.find(query, projection).max_time_ms(self.max_time_ms):
+            for name in ("sessions", "users"):
+                records.extend(
+                    (name, document["hll_precision"], int(index), rank)
+                    for index, rank in document.get(name, {}).items()
+                )
+
+        return merge_distinct_registers(records, self.distinct_sketch.precision)
+
+    def get_write_count(self, project_name: str, agent_name: str, day: datetime) -> int:
+        """Number of entries written for the agent on ``day``; changes whenever the day's data does."""
+        query = {"project_name": project_name, "agent_name": agent_name, "day": day_bucket(day)}
+        cursor = self.analytics_daily_rollups.find(query, {"writes": 1}).max_time_ms(self.max_time_ms)
+        return sum(document.get("writes", 0) for document in cursor)
+
+    def find_expired(self, cutoff: datetime, limit: int) -> List[Dict[str, Any]]:
+        """Oldest entries with ``timestamp`` before ``cutoff``, read from the primary."""
+        timestamp = self.layout.field("timestamp")
+        cursor = self.collection.find({timestamp: {"$lt": cutoff}}).sort(timestamp, 1).limit(limit)
+        return [self.layout.decode(document) for document in cursor]
+
+    def delete_logs(self, ids: List[Any]) -> int:
+        result = self.collection.delete_many({"_id": {"$in": ids}})
+        return result.deleted_count
+
+    def supports_change_streams(self) -> bool:
+        """Change streams need a replica set or a sharded cluster."""
+        hello = self.db.client.admin.command("hello")
+        return bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+
+    def decode_log(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Entry in the application shape for a stored document (e.g. a change stream ``fullDocument``)."""
+        return self.layout.decode(document)
+
+    def watch_inserts(self, resume_token: Optional[Dict[str, Any]] = None):
+        """Open a change stream over new log entries, resuming after ``resume_token``."""
+        return self.collection.watch(
+            [{"$match": {"operationType": "insert"}}],
+            resume_after=resume_token,
+            max_await_time_ms=1000
+        )
+
+    def close(self):
+        """Nothing is buffered on the MongoDB backend."""
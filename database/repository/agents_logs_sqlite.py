@@ -0,0 +1,632 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .repository import SQLiteRepository
+from .agents_logs import (
+    build_agent_overview,
+    day_bucket,
+    distinct_values,
+    latency_bucket,
+    merge_distinct_registers,
+    sort_overview
+)
+from config.env_variables import EnvVariables
+from utils.ddsketch import DDSketch
+from utils.hyperloglog import HyperLogLog
+from logs.logging import get_logger
+
+logger = get_logger("agents_logs_sqlite")
+
+COLUMNS = (
+    "project_name",
+    "agent_name",
+    "interaction_type",
+    "user_input",
+    "agent_response",
+    "metadata",
+    "session_id",
+    "status",
+    "execution_time_ms",
+    "timestamp",
+    "created_at",
+    "event_id",
+)
+
+REQUIRED_COLUMNS = ("project_name", "agent_name", "timestamp", "created_at")
+
+# Chave usada no lugar do bin de zeros do DDSketch (fora do alcance de log_gamma)
+ZERO_BIN_KEY = -(2 ** 62)
+
+
+def to_db_time(value: Optional[datetime]) -> Optional[str]:
+    """Format datetimes with a fixed width so text comparison matches time order."""
+    return value.isoformat(timespec="microseconds") if value else None
+
+
+def from_db_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def build_row(entry: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Row of ``COLUMNS`` for a log entry.
+
+    Raises:
+        ValueError: If a value cannot be stored, so the entry is rejected
+            before it is queued instead of failing the whole batch later.
+    """
+    for name in ("timestamp", "created_at"):
+        if not isinstance(entry.get(name), datetime):
+            raise ValueError(f"{name} must be a datetime")
+    execution_time_ms = entry.get("execution_time_ms")
+    if execution_time_ms is not None and (
+        isinstance(execution_time_ms, bool) or not isinstance(execution_time_ms, (int, float))
+    ):
+        raise ValueError("execution_time_ms must be a number")
+
+    row = (
+        entry.get("project_name"),
+        entry.get("agent_name"),
+        entry.get("interaction_type"),
+        entry.get("user_input"),
+        entry.get("agent_response"),
+        json.dumps(entry.get("metadata") or {}, default=str),
+        entry.get("session_id"),
+        entry.get("status"),
+        execution_time_ms,
+        to_db_time(entry["timestamp"]),
+        to_db_time(entry["created_at"]),
+        entry.get("event_id"),
+    )
+    for column, value in zip(COLUMNS, row):
+        if value is None and column in REQUIRED_COLUMNS:
+            raise ValueError(f"{column} is required")
+        if value is not None and not isinstance(value, (str, int, float)):
+            raise ValueError(f"{column} must be text or a number, not {type(value).__name__}")
+    return row
+
+
+def add_rollups(
+    latency: Counter,
+    registers: Dict[Tuple[Any, ...], int],
+    writes: Counter,
+    rollups: Tuple[Optional[Tuple[Any, ...]], List[Tuple[Tuple[Any, ...], int]], Tuple[Any, ...]]
+):
+    """Add the ``(latency bin, HLL registers, day)`` of one entry to the pending rollups."""
+    bin_id, entry_registers, day_id = rollups
+    if bin_id is not None:
+        latency[bin_id] += 1
+    for register_id, rank in entry_registers:
+        if rank > registers.get(register_id, 0):
+            registers[register_id] = rank
+    writes[day_id] += 1
+
+
+class SQLiteAgentsLogsRepository(SQLiteRepository):
+    """Agents logs stored in an embedded SQLite database.
+
+    Inserts are buffered and written in a single transaction once
+    ``batch_size`` rows are pending or ``flush_interval`` seconds have passed.
+    Reads flush the buffer first, so callers always see their own writes.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        read_connection: Optional[sqlite3.Connection] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        super(SQLiteAgentsLogsRepository, self).__init__(connection, table_name=EnvVariables.SQLITE_TABLE_AGENTS_LOGS)
+        # Consultas analíticas usam uma conexão somente leitura, com limite de tempo próprio
+        self.read_connection = read_connection or connection
+        self.read_lock = threading.Lock() if read_connection is not None else self.lock
+        self.max_time_ms = EnvVariables.ANALYTICS_MAX_TIME_MS
+        self.batch_size = batch_size or EnvVariables.SQLITE_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else EnvVariables.SQLITE_FLUSH_INTERVAL_SECONDS
+        self.latency_table = f"{self.table_name}_latency_sketches"
+        self.latency_sketch = DDSketch(EnvVariables.LATENCY_SKETCH_RELATIVE_ACCURACY)
+        self._pending: List[Tuple[Any, ...]] = []
+        # Rollups de cada linha de _pending, usados só se o lote precisar ser gravado linha a linha
+        self._pending_rollups: List[Tuple[Any, ...]] = []
+        # Entradas com event_id só entram nos rollups se o INSERT não for ignorado
+        self._pending_events: List[Tuple[Tuple[Any, ...], Tuple[Any, ...]]] = []
+        self._pending_latency: Counter = Counter()
+        self.distinct_table = f"{self.table_name}_daily_hll"
+        self.distinct_sketch = HyperLogLog(EnvVariables.HLL_PRECISION)
+        self._pending_registers: Dict[Tuple[Any, ...], int] = {}
+        self.writes_table = f"{self.table_name}_daily_writes"
+        self._pending_writes: Counter = Counter()
+        self._flush_timer: Optional[threading.Timer] = None
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """Create the table and the indexes used by the query paths."""
+        table = self.table_name
+        with self.lock:
+            self.connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    project_name TEXT NOT NULL,
+                    agent_name TEXT NOT NULL,
+                    interaction_type TEXT,
+                    user_input TEXT,
+                    agent_response TEXT,
+                    metadata TEXT,
+                    session_id TEXT,
+                    status TEXT,
+                    execution_time_ms REAL,
+                    timestamp TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    event_id TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_{table}_project_agent_ts ON {table} (project_name, agent_name, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_{table}_agent_ts ON {table} (agent_name, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_{table}_session_ts ON {table} (session_id, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_{table}_ts ON {table} (timestamp);
+                CREATE TABLE IF NOT EXISTS {self.latency_table} (
+                    project_name TEXT NOT NULL,
+                    agent_name TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    relative_accuracy REAL NOT NULL,
+                    key INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (project_name, agent_name, bucket, relative_accuracy, key)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS {self.distinct_table} (
+                    project_name TEXT NOT NULL,
+                    agent_name TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    hll_precision INTEGER NOT NULL,
+                    idx INTEGER NOT NULL,
+                    rank INTEGER NOT NULL,
+                    PRIMARY KEY (project_name, agent_name, day, name, hll_precision, idx)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS {self.writes_table} (
+                    project_name TEXT NOT NULL,
+                    agent_name TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    writes INTEGER NOT NULL,
+                    PRIMARY KEY (project_name, agent_name, day)
+                ) WITHOUT ROWID;
+            """)
+            columns = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            if "event_id" not in columns:
+                self.connection.execute(f"ALTER TABLE {table} ADD COLUMN event_id TEXT")
+            # Chave de idempotência: só entradas com event_id entram no índice
+            self.connection.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_project_event ON {table} (project_name, event_id) "
+                "WHERE event_id IS NOT NULL"
+            )
+
+    def insert_log(self, entry: Dict[str, Any]) -> bool:
+        """Queue a log entry; it is persisted on the next flush.
+
+        Duplicates of an ``event_id`` are only detected by the unique index
+        when the batch is written, so this returns True for every valid entry.
+
+        Raises:
+            ValueError: If the entry has a value SQLite cannot store.
+        """
+        self._queue(*self._prepare(entry))
+        return True
+
+    def insert_logs(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Queue several log entries; duplicates are dropped when the batch is written.
+
+        Every entry is validated before any of them is queued.
+        """
+        prepared = [self._prepare(entry) for entry in entries]
+        with self.lock:
+            for row, rollups in prepared:
+                self._queue(row, rollups)
+        return entries
+
+    def _prepare(self, entry: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Tuple[Any, ...]]:
+        """Validated row and rollups of an entry."""
+        row = build_row(entry)
+        day = to_db_time(day_bucket(entry["timestamp"]))
+
+        bin_id = None
+        if entry.get("execution_time_ms") is not None:
+            key = self.latency_sketch.key(entry["execution_time_ms"])
+            bin_id = (
+                entry["project_name"],
+                entry["agent_name"],
+                to_db_time(latency_bucket(entry["timestamp"])),
+                self.latency_sketch.relative_accuracy,
+                ZERO_BIN_KEY if key is None else key
+            )
+        registers = []
+        for name, value in distinct_values(entry).items():
+            index, rank = self.distinct_sketch.register(value)
+            registers.append((
+                (entry["project_name"], entry["agent_name"], day, name, self.distinct_sketch.precision, index),
+                rank
+            ))
+        rollups = (bin_id, registers, (entry["project_name"], entry["agent_name"], day))
+        return row, rollups
+
+    def _queue(self, row: Tuple[Any, ...], rollups: Tuple[Any, ...]):
+        with self.lock:
+            if row[-1] is None:
+                self._pending.append(row)
+                self._pending_rollups.append(rollups)
+                add_rollups(self._pending_latency, self._pending_registers, self._pending_writes, rollups)
+            else:
+                self._pending_events.append((row, rollups))
+            if len(self._pending) + len(self._pending_events) >= self.batch_size:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Write all pending rows in one transaction.
+
+        If the batch fails, it is written again row by row, and rows that
+        still fail are logged and dropped, so one bad row cannot block the
+        buffer. Errors that are not row-specific (e.g. a locked database)
+        keep the rows pending for the next flush.
+        """
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending and not self._pending_events:
+                return
+
+            try:
+                self._write_pending(row_by_row=False)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush {len(self._pending) + len(self._pending_events)} agent logs, retrying row by row: {e}")
+                self._write_pending(row_by_row=True)
+            self._pending = []
+            self._pending_rollups = []
+            self._pending_events = []
+            self._pending_latency = Counter()
+            self._pending_registers = {}
+            self._pending_writes = Counter()
+
+    def _write_pending(self, row_by_row: bool):
+        insert = f"INSERT INTO {self.table_name} ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+        if row_by_row:
+            latency, registers, writes = Counter(), {}, Counter()
+        else:
+            latency = Counter(self._pending_latency)
+            registers = dict(self._pending_registers)
+            writes = Counter(self._pending_writes)
+
+        def insert_row(sql: str, row: Tuple[Any, ...]) -> int:
+            if not row_by_row:
+                return self.connection.execute(sql, row).rowcount
+            # Savepoint por linha: só a linha com erro é descartada
+            self.connection.execute("SAVEPOINT agents_log_row")
+            try:
+                rowcount = self.connection.execute(sql, row).rowcount
+            except sqlite3.Error as e:
+                self.connection.execute("ROLLBACK TO agents_log_row")
+                logger.error(f"Dropped agent log for agent {row[1]} that could not be stored: {e}")
+                rowcount = 0
+            self.connection.execute("RELEASE agents_log_row")
+            return rowcount
+
+        self.connection.execute("BEGIN")
+        try:
+            if row_by_row:
+                for row, rollups in zip(self._pending, self._pending_rollups):
+                    if insert_row(insert, row):
+                        add_rollups(latency, registers, writes, rollups)
+            else:
+                self.connection.executemany(insert, self._pending)
+            for row, rollups in self._pending_events:
+                # rowcount 0: event_id já gravado (retry do cliente), não conta nos rollups
+                if insert_row(f"{insert} ON CONFLICT DO NOTHING", row):
+                    add_rollups(latency, registers, writes, rollups)
+            self.connection.executemany(
+                f"INSERT INTO {self.latency_table} "
+                f"(project_name, agent_name, bucket, relative_accuracy, key, count) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (project_name, agent_name, bucket, relative_accuracy, key) "
+                "DO UPDATE SET count = count + excluded.count",
+                [(*bin_id, count) for bin_id, count in latency.items()]
+            )
+            self.connection.executemany(
+                f"INSERT INTO {self.distinct_table} "
+                "(project_name, agent_name, day, name, hll_precision, idx, rank) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (project_name, agent_name, day, name, hll_precision, idx) "
+                "DO UPDATE SET rank = MAX(rank, excluded.rank)",
+                [(*register_id, rank) for register_id, rank in registers.items()]
+            )
+            self.connection.executemany(
+                f"INSERT INTO {self.writes_table} (project_name, agent_name, day, writes) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (project_name, agent_name, day) DO UPDATE SET writes = writes + excluded.writes",
+                [(*day_id, count) for day_id, count in writes.items()]
+            )
+            self.connection.execute("COMMIT")
+        except sqlite3.Error:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            # Mantém as linhas pendentes para a próxima tentativa
+            logger.error(f"Failed to flush pending agent logs: {e}")
+
+    def find_logs(
+        self,
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Return the newest log entries matching the filters."""
+        where, params = self._build_where(project_name, agent_name, session_id, start_date, end_date)
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM {self.table_name}{where} ORDER BY timestamp DESC LIMIT ?"
+
+        self.flush()
+        rows = self._read(sql, (*params, limit))
+
+        return [self._row_to_document(row) for row in rows]
+
+    def iter_log_batches(
+        self,
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream the entries matching the filters in ``id`` order, one batch at a time.
+
+        Each batch is a separate keyset query (``id > last id``), so the read
+        connection is never held between batches and ``after_id`` resumes a
+        previous run.
+        """
+        where, params = self._build_where(project_name, agent_name, session_id, start_date, end_date)
+        where = f"{where} AND id > ?" if where else " WHERE id > ?"
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM {self.table_name}{where} ORDER BY id LIMIT ?"
+
+        self.flush()
+        last_id = int(after_id) if after_id else 0
+        while True:
+            rows = self._read(sql, (*params, last_id, batch_size))
+            if not rows:
+                return
+            yield [self._row_to_document(row) for row in rows]
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    def get_statistics(
+        self,
+        project_name: str,
+        agent_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Aggregate interaction counts, statuses and average execution time in one query."""
+        where, params = self._build_where(project_name, agent_name, None, start_date, end_date)
+        sql = (
+            f"SELECT interaction_type, status, COUNT(*), SUM(execution_time_ms), COUNT(execution_time_ms) "
+            f"FROM {self.table_name}{where} GROUP BY interaction_type, status"
+        )
+
+        self.flush()
+        rows = self._read(sql, params)
+
+        total_interactions = 0
+        interaction_types: Dict[Any, int] = {}
+        task_statuses: Dict[Any, int] = {}
+        time_sum = 0.0
+        time_count = 0
+
+        for interaction_type, status, count, row_time_sum, row_time_count in rows:
+            total_interactions += count
+            interaction_types[interaction_type] = interaction_types.get(interaction_type, 0) + count
+            if status is not None:
+                task_statuses[status] = task_statuses.get(status, 0) + count
+            if row_time_count:
+                time_sum += row_time_sum
+                time_count += row_time_count
+
+        return {
+            "total_interactions": total_interactions,
+            "interaction_types": interaction_types,
+            "task_statuses": task_statuses,
+            "average_execution_time_ms": time_sum / time_count if time_count else None
+        }
+
+    def get_project_overview(
+        self,
+        project_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        sort_by: str = "total_interactions",
+        descending: bool = True,
+        top_n: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Summarize every agent of a project with a single GROUP BY over the project's index range."""
+        where, params = self._build_where(project_name, None, None, start_date, end_date)
+        sql = (
+            f"SELECT agent_name, interaction_type, status, COUNT(*), SUM(execution_time_ms), COUNT(execution_time_ms) "
+            f"FROM {self.table_name}{where} GROUP BY agent_name, interaction_type, status"
+        )
+
+        self.flush()
+        rows = self._read(sql, params)
+
+        return sort_overview(build_agent_overview(rows).values(), sort_by, descending, top_n)
+
+    def get_execution_time_sketch(
+        self,
+        project_name: str,
+        agent_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> DDSketch:
+        """Merge the hourly latency sketches that overlap the period, summing the bins in SQL."""
+        clauses = ["project_name = ?", "agent_name = ?"]
+        params: List[Any] = [project_name, agent_name]
+        if start_date:
+            clauses.append("bucket >= ?")
+            params.append(to_db_time(latency_bucket(start_date)))
+        if end_date:
+            clauses.append("bucket <= ?")
+            params.append(to_db_time(end_date))
+
+        sql = (
+            f"SELECT relative_accuracy, key, SUM(count) FROM {self.latency_table} "
+            f"WHERE {' AND '.join(clauses)} GROUP BY relative_accuracy, key"
+        )
+
+        self.flush()
+        rows = self._read(sql, params)
+
+        sketch = DDSketch(self.latency_sketch.relative_accuracy)
+        for relative_accuracy, key, count in rows:
+            if key == ZERO_BIN_KEY:
+                sketch.add_bins((), zero_count=count)
+            else:
+                sketch.add_bins([(key, count)], relative_accuracy=relative_accuracy)
+
+        return sketch
+
+    def get_distinct_counts(
+        self,
+        project_name: str,
+        agent_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Estimate unique sessions and users, merging the daily registers with MAX in SQL."""
+        clauses = ["project_name = ?", "agent_name = ?"]
+        params: List[Any] = [project_name, agent_name]
+        if start_date:
+            clauses.append("day >= ?")
+            params.append(to_db_time(day_bucket(start_date)))
+        if end_date:
+            clauses.append("day <= ?")
+            params.append(to_db_time(end_date))
+
+        sql = (
+            f"SELECT name, hll_precision, idx, MAX(rank) FROM {self.distinct_table} "
+            f"WHERE {' AND '.join(clauses)} GROUP BY name, hll_precision, idx"
+        )
+
+        self.flush()
+        records = self._read(sql, params)
+
+        return merge_distinct_registers(records, self.distinct_sketch.precision)
+
+    def get_write_count(self, project_name: str, agent_name: str, day: datetime) -> int:
+        """Number of entries written for the agent on ``day``; changes whenever the day's data does."""
+        sql = f"SELECT writes FROM {self.writes_table} WHERE project_name = ? AND agent_name = ? AND day = ?"
+
+        self.flush()
+        rows = self._read(sql, (project_name, agent_name, to_db_time(day_bucket(day))))
+
+        return rows[0][0] if rows else 0
+
+    def find_expired(self, cutoff: datetime, limit: int) -> List[Dict[str, Any]]:
+        """Oldest entries with ``timestamp`` before ``cutoff``."""
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM {self.table_name} WHERE timestamp < ? ORDER BY timestamp LIMIT ?"
+
+        with self.lock:
+            self.flush()
+            rows = self.connection.execute(sql, (to_db_time(cutoff), limit)).fetchall()
+
+        return [self._row_to_document(row) for row in rows]
+
+    def delete_logs(self, ids: List[Any]) -> int:
+        deleted = 0
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                # Lotes abaixo do limite de parâmetros por statement do SQLite
+                for start in range(0, len(ids), 500):
+                    chunk = [int(id_) for id_ in ids[start:start + 500]]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor = self.connection.execute(f"DELETE FROM {self.table_name} WHERE id IN ({placeholders})", chunk)
+                    deleted += cursor.rowcount
+                self.connection.execute("COMMIT")
+            except sqlite3.Error:
+                self.connection.execute("ROLLBACK")
+                raise
+        return deleted
+
+    def _read(self, sql: str, params) -> List[Tuple[Any, ...]]:
+        """Run an analytics query, interrupting it after ``max_time_ms`` (like MongoDB's maxTimeMS)."""
+        deadline = time.monotonic() + self.max_time_ms / 1000
+
+        with self.read_lock:
+            self.read_connection.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+            try:
+                return self.read_connection.execute(sql, params).fetchall()
+            finally:
+                self.read_connection.set_progress_handler(None, 0)
+
+    def supports_change_streams(self) -> bool:
+        """SQLite has no change feed; the live tail uses the ingestion path."""
+        return False
+
+    def close(self):
+        """Flush pending rows and close the connections."""
+        with self.lock:
+            self.flush()
+            if self.read_connection is not self.connection:
+                self.read_connection.close()
+            self.connection.close()
+
+    @staticmethod
+    def _build_where(
+        project_name: Optional[str],
+        agent_name: Optional[str],
+        session_id: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Tuple[str, List[Any]]:
+        clauses = []
+        params: List[Any] = []
+
+        if project_name:
+            clauses.append("project_name = ?")
+            params.append(project_name)
+        if agent_name:
+            clauses.append("agent_name = ?")
+            params.append(agent_name)
+        if session_id:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if start_date:
+            clauses.append("timestamp >= ?")
+            params.append(to_db_time(start_date))
+        if end_date:
+            clauses.append("timestamp <= ?")
+            params.append(to_db_time(end_date))
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    @staticmethod
+    def _row_to_document(row: Tuple[Any, ...]) -> Dict[str, Any]:
+        document = {"_id": str(row[0])}
+        document.update(zip(COLUMNS, row[1:]))
+        document["metadata"] = json.loads(document["metadata"]) if document["metadata"] else {}
+        document["timestamp"] = from_db_time(document["timestamp"])
+        document["created_at"] = from_db_time(document["created_at"])
+        # Campos opcionais ausentes não aparecem no documento, como no MongoDB
+        for field in ("status", "execution_time_ms", "event_id"):
+            if document[field] is None:
+                del document[field]
+        return document
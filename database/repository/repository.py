@@ -1,3 +1,5 @@
+import sqlite3
+import threading
 from pymongo.database import Database
 
 
@@ -9,4 +11,17 @@ class Repository:
 
     def __init__(self, db: Database, collection_name: str):
         self.db = db
-        self.collection = db.get_collection(collection_name)
\ No newline at end of file
+        self.collection = db.get_collection(collection_name)
+
+
+class SQLiteRepository:
+    """
+    class utilitária de repository para o SQLite
+    nunca será usada isolada, outras repository dependem dessa class
+    """
+
+    def __init__(self, connection: sqlite3.Connection, table_name: str):
+        self.connection = connection
+        self.table_name = table_name
+        # Uma única conexão é compartilhada entre threads (tools, timers de flush)
+        self.lock = threading.RLock()
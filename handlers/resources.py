@@ -1,4 +1,9 @@
+import json
+from datetime import date
+from urllib.parse import unquote
 from logs.logging import get_logger
+from logs.agents import agents_logger
+from logs.live_tail import parse_tail_uri
 
 logger = get_logger("resources")
 
@@ -24,4 +29,130 @@ def register_resources(mcp):
         logger.debug(f"Generated greeting: {greeting}")
         return greeting
     
+    @mcp.resource("agents-tail://{project_name}/{agent_name}", mime_type="application/json")
+    def get_agents_tail(project_name: str, agent_name: str) -> str:
+        """Latest log entries of an agent, served from the live tail buffer.
+        
+        Subscribe to this URI to be notified when new entries arrive, then
+        read ``agents-tail://{project_name}/{agent_name}/{resume_token}`` with
+        the token from the previous read to get only the new entries.
+        
+        Args:
+            project_name: Human-readable name of the project (URL-encoded)
+            agent_name: Human-readable name of the agent (URL-encoded)
+            
+        Returns:
+            JSON with the entries, the resume token and a truncated flag
+        """
+        tail = agents_logger.live_tail.read(unquote(project_name), unquote(agent_name))
+        return json.dumps(tail)
+    
+    @mcp.resource("agents-tail://{project_name}/{agent_name}/{resume_token}", mime_type="application/json")
+    def get_agents_tail_since(project_name: str, agent_name: str, resume_token: str) -> str:
+        """Log entries of an agent that arrived after ``resume_token``.
+        
+        Args:
+            project_name: Human-readable name of the project (URL-encoded)
+            agent_name: Human-readable name of the agent (URL-encoded)
+            resume_token: Token returned by the previous tail read
+            
+        Returns:
+            JSON with the new entries, the next resume token and a truncated
+            flag that is true when entries may have been missed
+        """
+        tail = agents_logger.live_tail.read(unquote(project_name), unquote(agent_name), unquote(resume_token))
+        return json.dumps(tail)
+    
+    @mcp.resource("agents-stats://{project_name}/{agent_name}/{day}", mime_type="application/json")
+    def get_agents_daily_stats(project_name: str, agent_name: str, day: str) -> str:
+        """Statistics of an agent for one day, with a version for caching.
+        
+        Re-read ``agents-stats://{project_name}/{agent_name}/{day}/{version}``
+        with the version from a previous read to revalidate it cheaply. Days
+        closed for longer than RESOURCE_CLOSED_DAY_GRACE_SECONDS are marked
+        immutable and can be cached indefinitely.
+        
+        Args:
+            project_name: Human-readable name of the project (URL-encoded)
+            agent_name: Human-readable name of the agent (URL-encoded)
+            day: Day in YYYY-MM-DD format
+            
+        Returns:
+            JSON with the version, the immutable flag and the statistics
+        """
+        stats = agents_logger.get_daily_statistics(unquote(project_name), unquote(agent_name), date.fromisoformat(day))
+        return json.dumps(stats)
+    
+    @mcp.resource("agents-stats://{project_name}/{agent_name}/{day}/{version}", mime_type="application/json")
+    def get_agents_daily_stats_if_modified(project_name: str, agent_name: str, day: str, version: str) -> str:
+        """Statistics of an agent for one day, unless ``version`` is still current.
+        
+        Args:
+            project_name: Human-readable name of the project (URL-encoded)
+            agent_name: Human-readable name of the agent (URL-encoded)
+            day: Day in YYYY-MM-DD format
+            version: Version returned by the previous read
+            
+        Returns:
+            JSON with ``not_modified`` set when the cached copy is still valid,
+            otherwise the same content as the unversioned resource
+        """
+        stats = agents_logger.get_daily_statistics(
+            unquote(project_name), unquote(agent_name), date.fromisoformat(day), known_version=unquote(version)
+        )
+        return json.dumps(stats)
+    
+    @mcp.resource("agents-logs://{project_name}/{agent_name}/{day}", mime_type="application/json")
+    def get_agents_daily_logs(project_name: str, agent_name: str, day: str) -> str:
+        """Log entries of an agent for one day, newest first, with a version for caching.
+        
+        Revalidate with ``agents-logs://{project_name}/{agent_name}/{day}/{version}``.
+        
+        Args:
+            project_name: Human-readable name of the project (URL-encoded)
+            agent_name: Human-readable name of the agent (URL-encoded)
+            day: Day in YYYY-MM-DD format
+            
+        Returns:
+            JSON with the version, the immutable flag, the entries and a
+            truncated flag set when the day has more than RESOURCE_DAY_LOGS_LIMIT entries
+        """
+        logs = agents_logger.get_daily_logs(unquote(project_name), unquote(agent_name), date.fromisoformat(day))
+        return json.dumps(logs)
+    
+    @mcp.resource("agents-logs://{project_name}/{agent_name}/{day}/{version}", mime_type="application/json")
+    def get_agents_daily_logs_if_modified(project_name: str, agent_name: str, day: str, version: str) -> str:
+        """Log entries of an agent for one day, unless ``version`` is still current.
+        
+        Args:
+            project_name: Human-readable name of the project (URL-encoded)
+            agent_name: Human-readable name of the agent (URL-encoded)
+            day: Day in YYYY-MM-DD format
+            version: Version returned by the previous read
+            
+        Returns:
+            JSON with ``not_modified`` set when the cached copy is still valid,
+            otherwise the same content as the unversioned resource
+        """
+        logs = agents_logger.get_daily_logs(
+            unquote(project_name), unquote(agent_name), date.fromisoformat(day), known_version=unquote(version)
+        )
+        return json.dumps(logs)
+    
+    @mcp._mcp_server.subscribe_resource()
+    async def subscribe_resource(uri) -> None:
+        """Register the requesting session for updates of an ``agents-tail://`` resource."""
+        target = parse_tail_uri(str(uri))
+        if target is None:
+            logger.warning(f"Subscription ignored for unsupported resource: {uri}")
+            return
+        agents_logger.live_tail.subscribe(*target, uri=str(uri), session=mcp.get_context().session)
+    
+    @mcp._mcp_server.unsubscribe_resource()
+    async def unsubscribe_resource(uri) -> None:
+        """Stop sending updates of an ``agents-tail://`` resource to the requesting session."""
+        target = parse_tail_uri(str(uri))
+        if target is not None:
+            agents_logger.live_tail.unsubscribe(*target, session=mcp.get_context().session)
+    
     logger.info("Resources registered successfully")
@@ -1,5 +1,10 @@
+import functools
+import hmac
+import anyio
 from logs.logging import get_logger
-from logs.agents import agents_logger
+from logs.agents import AgentInteraction, agents_logger
+from logs.profiling import tool_profiler
+from config.env_variables import EnvVariables
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
@@ -14,6 +19,7 @@ def register_tools(mcp):
     """
     
     @mcp.tool()
+    @tool_profiler.profiled("add")
     def add(a: int, b: int) -> int:
         """Add two numbers together.
         
@@ -33,6 +39,7 @@ def register_tools(mcp):
         return result
     
     @mcp.tool()
+    @tool_profiler.profiled("log_agents_interaction")
     def log_agents_interaction(
         project_name: str,
         agent_name: str,
@@ -40,7 +47,9 @@ def register_tools(mcp):
         user_input: Optional[str] = None,
         agent_response: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        execution_time_ms: Optional[float] = None,
+        event_id: Optional[str] = None
     ) -> bool:
         """Log an AI agent interaction to MongoDB.
         
@@ -52,9 +61,12 @@ def register_tools(mcp):
             agent_response: Agent's response
             metadata: Additional metadata about the interaction
             session_id: Session identifier for grouping related interactions
+            execution_time_ms: How long the agent took to handle the interaction
+            event_id: Unique ID generated by the client for this interaction;
+                retries with the same ID are stored only once
             
         Returns:
-            bool: True if log was successful, False otherwise
+            bool: True if log was successful (or was already stored), False otherwise
             
         Example:
             >>> log_agents_interaction(
@@ -64,7 +76,9 @@ def register_tools(mcp):
             ...     user_input="How can I reset my password?",
             ...     agent_response="You can reset your password by clicking...",
             ...     metadata={"user_id": "123"},
-            ...     session_id="session_123"
+            ...     session_id="session_123",
+            ...     execution_time_ms=1830.5,
+            ...     event_id="0f8fad5b-d9cb-469f-a165-70867728950e"
             ... )
             True
         """
@@ -76,7 +90,9 @@ def register_tools(mcp):
                 user_input=user_input,
                 agent_response=agent_response,
                 metadata=metadata,
-                session_id=session_id
+                session_id=session_id,
+                execution_time_ms=execution_time_ms,
+                event_id=event_id
             )
             
             if success:
@@ -89,8 +105,46 @@ def register_tools(mcp):
         except Exception as e:
             logger.error(f"Error logging AI agent interaction: {e}")
             return False
+    
+    @mcp.tool()
+    @tool_profiler.profiled("log_agents_interactions")
+    def log_agents_interactions(interactions: List[AgentInteraction]) -> bool:
+        """Log several AI agent interactions in a single bulk write.
+        
+        Args:
+            interactions: Interactions with the same fields as log_agents_interaction
+                (project_name, agent_name and interaction_type are required) plus an
+                optional ISO 8601 timestamp; entries whose event_id was already
+                stored are skipped
+            
+        Returns:
+            bool: True if every interaction was logged (or was already stored), False otherwise
+            
+        Example:
+            >>> log_agents_interactions(interactions=[
+            ...     {"project_name": "Customer Support", "agent_name": "Customer Support Bot",
+            ...      "interaction_type": "chat", "event_id": "evt-1"},
+            ...     {"project_name": "Customer Support", "agent_name": "Customer Support Bot",
+            ...      "interaction_type": "task", "event_id": "evt-2", "execution_time_ms": 420.0}
+            ... ])
+            True
+        """
+        try:
+            success = agents_logger.log_agent_interactions(interactions)
+            
+            if success:
+                logger.info(f"Successfully logged {len(interactions)} interactions")
+            else:
+                logger.error(f"Failed to log {len(interactions)} interactions")
+            
+            return success
+            
+        except Exception as e:
+            logger.error(f"Error logging AI agent interactions: {e}")
+            return False
 
     @mcp.tool()
+    @tool_profiler.profiled("get_agents_logs")
     def get_agents_logs(
         agent_name: Optional[str] = None,
         session_id: Optional[str] = None,
@@ -154,7 +208,9 @@ def register_tools(mcp):
             return []
     
     @mcp.tool()
+    @tool_profiler.profiled("get_agents_statistics")
     def get_agents_statistics(
+        project_name: str,
         agent_name: str,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
@@ -162,25 +218,34 @@ def register_tools(mcp):
         """Get statistics for a specific AI agent from MongoDB.
         
         Args:
+            project_name: Human-readable name of the project
             agent_name: Agent name to get statistics for
             start_date: Start date for statistics period (ISO format: YYYY-MM-DD)
             end_date: End date for statistics period (ISO format: YYYY-MM-DD)
             
         Returns:
-            Dict[str, Any]: Agent statistics including interaction counts, task statuses, etc.
+            Dict[str, Any]: Agent statistics including interaction counts, approximate
+            unique sessions/users, task statuses, etc. With retention enabled, the
+            counts, statuses and average only cover entries still in the database;
+            unique counts and percentiles also cover archived periods.
             
         Example:
             >>> get_agents_statistics(
+            ...     project_name="Customer Support",
             ...     agent_name="agent_001",
             ...     start_date="2024-01-01",
             ...     end_date="2024-01-31"
             ... )
             {
+                "project_name": "Customer Support",
                 "agent_name": "agent_001",
                 "total_interactions": 150,
+                "unique_sessions": 42,
+                "unique_users": 37,
                 "interaction_types": {"chat": 100, "task": 50},
                 "task_statuses": {"completed": 45, "failed": 5},
-                "average_execution_time_ms": 2500.0
+                "average_execution_time_ms": 2500.0,
+                "execution_time_percentiles_ms": {"p50": 1900.0, "p90": 4800.0, "p99": 9100.0}
             }
         """
         try:
@@ -203,6 +268,7 @@ def register_tools(mcp):
                     return {}
             
             statistics = agents_logger.get_agent_statistics(
+                project_name=project_name,
                 agent_name=agent_name,
                 start_date=start_dt,
                 end_date=end_dt
@@ -215,4 +281,196 @@ def register_tools(mcp):
             logger.error(f"Error retrieving AI agent statistics: {e}")
             return {}
     
+    @mcp.tool()
+    @tool_profiler.profiled("get_project_overview")
+    def get_project_overview(
+        project_name: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        sort_by: str = "total_interactions",
+        descending: bool = True,
+        top_n: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get statistics for every AI agent of a project in a single query.
+        
+        Args:
+            project_name: Human-readable name of the project
+            start_date: Start date for statistics period (ISO format: YYYY-MM-DD)
+            end_date: End date for statistics period (ISO format: YYYY-MM-DD)
+            sort_by: Order agents by total_interactions, average_execution_time_ms or agent_name
+            descending: Sort from highest to lowest (default: True)
+            top_n: Return only the first N agents after sorting (default: all; must be at least 1)
+            
+        Returns:
+            Dict[str, Any]: Per-agent totals, interaction types, task statuses and average execution time
+            
+        Example:
+            >>> get_project_overview(
+            ...     project_name="Customer Support",
+            ...     start_date="2024-01-01",
+            ...     top_n=2
+            ... )
+            {
+                "project_name": "Customer Support",
+                "agents": [
+                    {
+                        "agent_name": "agent_001",
+                        "total_interactions": 150,
+                        "interaction_types": {"chat": 100, "task": 50},
+                        "task_statuses": {"completed": 45, "failed": 5},
+                        "average_execution_time_ms": 2500.0
+                    },
+                    ...
+                ],
+                "period": {"start_date": "2024-01-01T00:00:00", "end_date": None}
+            }
+        """
+        try:
+            # Parse date strings if provided
+            start_dt = None
+            end_dt = None
+            
+            if start_date:
+                try:
+                    start_dt = datetime.fromisoformat(start_date)
+                except ValueError:
+                    logger.error(f"Invalid start_date format: {start_date}. Use YYYY-MM-DD format.")
+                    return {}
+            
+            if end_date:
+                try:
+                    end_dt = datetime.fromisoformat(end_date)
+                except ValueError:
+                    logger.error(f"Invalid end_date format: {end_date}. Use YYYY-MM-DD format.")
+                    return {}
+            
+            overview = agents_logger.get_project_overview(
+                project_name=project_name,
+                start_date=start_dt,
+                end_date=end_dt,
+                sort_by=sort_by,
+                descending=descending,
+                top_n=top_n
+            )
+            
+            logger.info(f"Retrieved overview for project {project_name}")
+            return overview
+            
+        except Exception as e:
+            logger.error(f"Error retrieving project overview: {e}")
+            return {}
+    
+    # A exportação roda em uma worker thread para não bloquear o event loop durante o streaming
+    profiled_export = tool_profiler.profiled("export_agents_logs")(agents_logger.export_agent_logs)
+    
+    @mcp.tool()
+    async def export_agents_logs(
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        export_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Export AI agent logs to a gzip-compressed NDJSON file on the server.
+        
+        Use this instead of get_agents_logs with a huge limit: entries are
+        streamed to disk in batches and only a summary is returned. If the
+        export is interrupted, call again with the returned export_id to
+        resume after the last exported entry.
+        
+        Args:
+            project_name: Filter by specific project name
+            agent_name: Filter by specific agent name
+            session_id: Filter by specific session ID
+            start_date: Filter logs from this date onwards (ISO format: YYYY-MM-DD)
+            end_date: Filter logs up to this date (ISO format: YYYY-MM-DD)
+            export_id: Export to resume; its original filters are reused
+            
+        Returns:
+            Dict[str, Any]: Export id, file path, row count, last exported _id and
+            whether the export is complete
+            
+        Example:
+            >>> export_agents_logs(project_name="Customer Support", start_date="2024-01-01")
+            {
+                "export_id": "agents_logs_20240201120000_1a2b3c4d",
+                "path": "/mcp/app/exports/agents_logs_20240201120000_1a2b3c4d.ndjson.gz",
+                "rows": 125000,
+                "last_id": "65bb7c1e9f1c2a0012345678",
+                "complete": True
+            }
+        """
+        try:
+            # Parse date strings if provided
+            start_dt = None
+            end_dt = None
+            
+            if start_date:
+                try:
+                    start_dt = datetime.fromisoformat(start_date)
+                except ValueError:
+                    logger.error(f"Invalid start_date format: {start_date}. Use YYYY-MM-DD format.")
+                    return {}
+            
+            if end_date:
+                try:
+                    end_dt = datetime.fromisoformat(end_date)
+                except ValueError:
+                    logger.error(f"Invalid end_date format: {end_date}. Use YYYY-MM-DD format.")
+                    return {}
+            
+            summary = await anyio.to_thread.run_sync(functools.partial(
+                profiled_export,
+                project_name=project_name,
+                agent_name=agent_name,
+                session_id=session_id,
+                start_date=start_dt,
+                end_date=end_dt,
+                export_id=export_id
+            ))
+            
+            logger.info(f"Export {summary.get('export_id')} finished with {summary.get('rows')} rows")
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Error exporting agent logs: {e}")
+            return {}
+    
+    @mcp.tool()
+    def configure_profiling(
+        admin_key: str,
+        enabled: Optional[bool] = None,
+        sample_rate: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Turn on-demand profiling of tool calls on or off (admin only).
+        
+        Sampled calls are profiled with cProfile and a stack sampler; aggregated
+        per-tool profiles (.prof) and collapsed stacks (.collapsed) are written
+        under LOG_PATH/profiles.
+        
+        Args:
+            admin_key: Value of MCP_ADMIN_API_KEY
+            enabled: Enable or disable profiling (unchanged when omitted)
+            sample_rate: Fraction of calls to profile, between 0 and 1 (unchanged when omitted)
+            
+        Returns:
+            Dict[str, Any]: Current profiling settings and disk usage, or an error
+            
+        Example:
+            >>> configure_profiling(admin_key="...", enabled=True, sample_rate=0.05)
+            {"enabled": True, "sample_rate": 0.05, "path": "/mcp/app/logs/profiles", ...}
+        """
+        if not EnvVariables.MCP_ADMIN_API_KEY or not hmac.compare_digest(
+            admin_key.encode(), EnvVariables.MCP_ADMIN_API_KEY.encode()
+        ):
+            logger.warning("Rejected configure_profiling call with invalid admin key")
+            return {"error": "unauthorized"}
+        
+        try:
+            return tool_profiler.configure(enabled=enabled, sample_rate=sample_rate)
+        except ValueError as e:
+            logger.error(f"Invalid profiling configuration: {e}")
+            return {"error": str(e)}
+    
     logger.info("Tools registered successfully")
@@ -1,18 +1,31 @@
 """
 Agents Logger Module
 
-Handles logging of agents activities to MongoDB database.
+Handles logging of agents activities to the configured storage backend
+(MongoDB or embedded SQLite).
 """
 
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import atexit
+import sqlite3
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, List, Optional, Any
 from pymongo.errors import PyMongoError
+from pydantic import BaseModel, ConfigDict
 from bson import ObjectId
 from logs.logging import get_logger
-from database.manager_db import ManagerMongoDB
+from logs.export import ExportInProgressError, LogExporter
+from logs.live_tail import LiveTail
+from logs.retention import RetentionJob
+from config.env_variables import EnvVariables
+from database.archive import LogArchive, log_key
+from database.repository.agents_logs import OVERVIEW_SORT_FIELDS
+from utils.versioned_cache import VersionedCache
 
 logger = get_logger("agents_logger")
 
+# Percentis de execution_time_ms reportados nas estatísticas
+LATENCY_PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
 
 def serialize_mongo_document(doc: Dict[str, Any]) -> Dict[str, Any]:
     """Convert MongoDB document to JSON-serializable format.
@@ -48,12 +61,76 @@ def serialize_mongo_document(doc: Dict[str, Any]) -> Dict[str, Any]:
     return serialized
 
 
+class AgentInteraction(BaseModel):
+    """One entry of a bulk log call, validated before anything is written."""
+
+    # Números em campos de texto viram texto (ex.: event_id 7 == "7"); campos desconhecidos são rejeitados
+    model_config = ConfigDict(extra="forbid", coerce_numbers_to_str=True)
+
+    project_name: str
+    agent_name: str
+    interaction_type: str
+    user_input: Optional[str] = None
+    agent_response: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    session_id: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    execution_time_ms: Optional[float] = None
+    event_id: Optional[str] = None
+
+
+def build_log_entry(
+    project_name: str,
+    agent_name: str,
+    interaction_type: str,
+    user_input: Optional[str] = None,
+    agent_response: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    session_id: Optional[str] = None,
+    timestamp: Optional[datetime | str] = None,
+    execution_time_ms: Optional[float] = None,
+    event_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the stored document of an interaction; optional fields are omitted when unset."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    
+    log_entry = {
+        "project_name": project_name,
+        "agent_name": agent_name,
+        "interaction_type": interaction_type,
+        "user_input": user_input,
+        "agent_response": agent_response,
+        "metadata": metadata or {},
+        "session_id": session_id,
+        "timestamp": timestamp or datetime.now(),
+        "created_at": datetime.now()
+    }
+    if execution_time_ms is not None:
+        log_entry["execution_time_ms"] = execution_time_ms
+    if event_id is not None:
+        # Sempre texto: o índice único do MongoDB só cobre event_id do tipo string
+        log_entry["event_id"] = str(event_id)
+    
+    return log_entry
+
+
 class AgentsLogger:
     """Logger for agents activities and interactions."""
     
     def __init__(self):
-        """Initialize the Agents Logger."""
-        self.collection = ManagerMongoDB.agents_logs_repository.collection
+        """Initialize the Agents Logger with the configured storage backend."""
+        if EnvVariables.STORAGE_BACKEND == "sqlite":
+            from database.manager_sqlite import ManagerSQLite
+            self.repository = ManagerSQLite.agents_logs_repository
+        else:
+            from database.manager_db import ManagerMongoDB
+            self.repository = ManagerMongoDB.agents_logs_repository
+        self.live_tail = LiveTail(self.repository, serializer=serialize_mongo_document)
+        self.archive = LogArchive()
+        self.retention = RetentionJob(self.repository, self.archive, serializer=serialize_mongo_document)
+        self.resource_cache = VersionedCache(EnvVariables.RESOURCE_CACHE_SIZE)
+        self.exporter = LogExporter(self.repository, serializer=serialize_mongo_document)
     
     def log_agent_interaction(
         self,
@@ -64,7 +141,9 @@ class AgentsLogger:
         agent_response: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
         session_id: Optional[str] = None,
-        timestamp: Optional[datetime] = None
+        timestamp: Optional[datetime] = None,
+        execution_time_ms: Optional[float] = None,
+        event_id: Optional[str] = None
     ) -> bool:
         """Log an Agents interaction.
         
@@ -77,34 +156,78 @@ class AgentsLogger:
             metadata: Additional metadata about the interaction
             session_id: Session identifier for grouping related interactions
             timestamp: When the interaction occurred (defaults to now)
+            execution_time_ms: How long the agent took to handle the interaction
+            event_id: Client-generated idempotency key; retries with the same
+                key in the same project are stored only once
             
         Returns:
-            bool: True if log was successful, False otherwise
+            bool: True if log was successful (or already stored), False otherwise
         """
         try:
-            log_entry = {
-                "project_name": project_name,
-                "agent_name": agent_name,
-                "interaction_type": interaction_type,
-                "user_input": user_input,
-                "agent_response": agent_response,
-                "metadata": metadata or {},
-                "session_id": session_id,
-                "timestamp": timestamp or datetime.now(),
-                "created_at": datetime.now()
-            }
+            log_entry = build_log_entry(
+                project_name=project_name,
+                agent_name=agent_name,
+                interaction_type=interaction_type,
+                user_input=user_input,
+                agent_response=agent_response,
+                metadata=metadata,
+                session_id=session_id,
+                timestamp=timestamp,
+                execution_time_ms=execution_time_ms,
+                event_id=event_id
+            )
             
-            result = self.collection.insert_one(log_entry)
-            logger.debug(f"Logged interaction for agent {agent_name}: {result.inserted_id}")
+            if self.repository.insert_log(log_entry):
+                self.live_tail.publish_ingested(log_entry)
+                logger.debug(f"Logged interaction for agent {agent_name}")
+            else:
+                logger.debug(f"Ignored duplicate event {event_id} for agent {agent_name}")
             return True
             
-        except PyMongoError as e:
+        except ValueError as e:
+            logger.error(f"Invalid agent interaction: {e}")
+            return False
+        except (PyMongoError, sqlite3.Error) as e:
             logger.error(f"Failed to log agent interaction: {e}")
             return False
         except Exception as e:
             logger.error(f"Unexpected error logging agent interaction: {e}")
             return False
     
+    def log_agent_interactions(self, interactions: List[AgentInteraction | Dict[str, Any]]) -> bool:
+        """Log several Agents interactions in one bulk write.
+        
+        Every interaction is validated before anything is written, so an
+        invalid entry rejects the whole call.
+        
+        Args:
+            interactions: Interactions with the same fields accepted by
+                ``log_agent_interaction``; ``timestamp`` may be an ISO string
+            
+        Returns:
+            bool: True if every interaction was stored (or already stored), False otherwise
+        """
+        try:
+            log_entries = [
+                build_log_entry(**AgentInteraction.model_validate(interaction).model_dump())
+                for interaction in interactions
+            ]
+            
+            for log_entry in self.repository.insert_logs(log_entries):
+                self.live_tail.publish_ingested(log_entry)
+            logger.debug(f"Logged {len(log_entries)} interactions in bulk")
+            return True
+            
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid interaction in bulk log: {e}")
+            return False
+        except (PyMongoError, sqlite3.Error) as e:
+            logger.error(f"Failed to log agent interactions: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error logging agent interactions: {e}")
+            return False
+    
     def get_agent_logs(
         self,
         project_name: Optional[str] = None,
@@ -128,37 +251,61 @@ class AgentsLogger:
             List[Dict[str, Any]]: List of log entries
         """
         try:
-            query = {}
-            
-            if project_name:
-                query["project_name"] = project_name
-            if agent_name:
-                query["agent_name"] = agent_name
-            if session_id:
-                query["session_id"] = session_id
-            if start_date or end_date:
-                query["timestamp"] = {}
-                if start_date:
-                    query["timestamp"]["$gte"] = start_date
-                if end_date:
-                    query["timestamp"]["$lte"] = end_date
-            
-            cursor = self.collection.find(query).sort("timestamp", -1).limit(limit)
-            logs = list(cursor)
-            
-            # Serialize MongoDB documents to JSON-serializable format
-            serialized_logs = [serialize_mongo_document(log) for log in logs]
+            serialized_logs = self._find_logs(project_name, agent_name, session_id, start_date, end_date, limit)
             
             logger.debug(f"Retrieved {len(serialized_logs)} logs for project {project_name} and agent {agent_name}")
             return serialized_logs
             
-        except PyMongoError as e:
+        except (PyMongoError, sqlite3.Error) as e:
             logger.error(f"Failed to retrieve agent logs for project {project_name} and agent {agent_name}: {e}")
             return []
         except Exception as e:
             logger.error(f"Unexpected error retrieving agent logs for project {project_name} and agent {agent_name}: {e}")
             return []
     
+    def _find_logs(
+        self,
+        project_name: Optional[str],
+        agent_name: Optional[str],
+        session_id: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Serialized log entries from the database, completed with the archive."""
+        logs = self.repository.find_logs(
+            project_name=project_name,
+            agent_name=agent_name,
+            session_id=session_id,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit
+        )
+        
+        # Serialize MongoDB documents to JSON-serializable format
+        serialized_logs = [serialize_mongo_document(log) for log in logs]
+        
+        # Só um período explícito que alcança dados anteriores à janela quente abre as partições
+        # do arquivo: start_date anterior a ela, ou só um end_date anterior (leitura a partir dele)
+        bound = start_date if start_date is not None else end_date
+        if (
+            self.retention.enabled
+            and len(serialized_logs) < limit
+            and bound is not None
+            and bound < self.retention.cutoff()
+        ):
+            serialized_logs.extend(self.archive.find_logs(
+                project_name=project_name,
+                agent_name=agent_name,
+                session_id=session_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit - len(serialized_logs),
+                exclude_keys={log_key(log) for log in serialized_logs}
+            ))
+        
+        return serialized_logs
+    
     def get_agent_statistics(
         self,
         project_name: str,
@@ -178,67 +325,295 @@ class AgentsLogger:
             Dict[str, Any]: Agent statistics
         """
         try:
-            query = {"project_name": project_name, "agent_name": agent_name}
-            
-            if start_date or end_date:
-                query["timestamp"] = {}
-                if start_date:
-                    query["timestamp"]["$gte"] = start_date
-                if end_date:
-                    query["timestamp"]["$lte"] = end_date
-            
-            # Count total interactions
-            total_interactions = self.collection.count_documents(query)
-            
-            # Count by interaction type
-            interaction_types = list(self.collection.aggregate([
-                {"$match": query},
-                {"$group": {"_id": "$interaction_type", "count": {"$sum": 1}}}
-            ]))
-            
-            # Count by status (for tasks)
-            task_statuses = list(self.collection.aggregate([
-                {"$match": {**query, "status": {"$exists": True}}},
-                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
-            ]))
-            
-            # Get average execution time
-            avg_execution_time = self.collection.aggregate([
-                {"$match": {**query, "execution_time_ms": {"$exists": True}}},
-                {"$group": {"_id": None, "avg_time": {"$avg": "$execution_time_ms"}}}
-            ])
-            avg_time_result = list(avg_execution_time)
-            avg_execution_time_ms = avg_time_result[0]["avg_time"] if avg_time_result else None
-            
-            statistics = {
+            statistics = self._build_statistics(project_name, agent_name, start_date, end_date)
+            
+            logger.debug(f"Retrieved statistics for project {project_name} and agent {agent_name}")
+            return statistics
+            
+        except (PyMongoError, sqlite3.Error) as e:
+            logger.error(f"Failed to get agent statistics for project {project_name} and agent {agent_name}: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Unexpected error getting agent statistics: {e}")
+            return {}
+
+    def _build_statistics(
+        self,
+        project_name: str,
+        agent_name: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Dict[str, Any]:
+        """Serialized statistics of an agent; storage errors propagate."""
+        aggregates = self.repository.get_statistics(
+            project_name=project_name,
+            agent_name=agent_name,
+            start_date=start_date,
+            end_date=end_date
+        )
+        latency_sketch = self.repository.get_execution_time_sketch(
+            project_name=project_name,
+            agent_name=agent_name,
+            start_date=start_date,
+            end_date=end_date
+        )
+        distinct_counts = self.repository.get_distinct_counts(
+            project_name=project_name,
+            agent_name=agent_name,
+            start_date=start_date,
+            end_date=end_date
+        )
+        
+        statistics = {
+            "project_name": project_name,
+            "agent_name": agent_name,
+            "total_interactions": aggregates["total_interactions"],
+            "unique_sessions": distinct_counts["sessions"],
+            "unique_users": distinct_counts["users"],
+            "interaction_types": {
+                str(key) if isinstance(key, ObjectId) else key: count 
+                for key, count in aggregates["interaction_types"].items()
+            },
+            "task_statuses": {
+                str(key) if isinstance(key, ObjectId) else key: count 
+                for key, count in aggregates["task_statuses"].items()
+            },
+            "average_execution_time_ms": aggregates["average_execution_time_ms"],
+            "execution_time_percentiles_ms": {
+                name: latency_sketch.quantile(q) for name, q in LATENCY_PERCENTILES.items()
+            } if latency_sketch.count else None,
+            "period": {
+                "start_date": start_date.isoformat() if start_date else None,
+                "end_date": end_date.isoformat() if end_date else None
+            }
+        }
+        
+        return serialize_mongo_document(statistics)
+
+    def get_project_overview(
+        self,
+        project_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        sort_by: str = "total_interactions",
+        descending: bool = True,
+        top_n: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get per-agent statistics for a whole project in one query.
+        
+        Args:
+            project_name: Human-readable name of the project
+            start_date: Start date for statistics period
+            end_date: End date for statistics period
+            sort_by: Field to order agents by (total_interactions, average_execution_time_ms or agent_name)
+            descending: Whether to sort in descending order
+            top_n: Maximum number of agents to return (all when omitted; must be at least 1)
+            
+        Returns:
+            Dict[str, Any]: Project overview with one summary per agent
+        """
+        try:
+            if sort_by not in OVERVIEW_SORT_FIELDS:
+                logger.error(f"Invalid sort_by for project overview: {sort_by}")
+                return {}
+            if top_n is not None and top_n < 1:
+                logger.error(f"Invalid top_n for project overview: {top_n}")
+                return {}
+            
+            agents = self.repository.get_project_overview(
+                project_name=project_name,
+                start_date=start_date,
+                end_date=end_date,
+                sort_by=sort_by,
+                descending=descending,
+                top_n=top_n
+            )
+            
+            overview = {
                 "project_name": project_name,
-                "agent_name": agent_name,
-                "total_interactions": total_interactions,
-                "interaction_types": {
-                    str(item["_id"]) if isinstance(item["_id"], ObjectId) else item["_id"]: item["count"] 
-                    for item in interaction_types
-                },
-                "task_statuses": {
-                    str(item["_id"]) if isinstance(item["_id"], ObjectId) else item["_id"]: item["count"] 
-                    for item in task_statuses
-                },
-                "average_execution_time_ms": avg_execution_time_ms,
+                "agents": agents,
                 "period": {
                     "start_date": start_date.isoformat() if start_date else None,
                     "end_date": end_date.isoformat() if end_date else None
                 }
             }
             
-            logger.debug(f"Retrieved statistics for project {project_name} and agent {agent_name}")
-            return serialize_mongo_document(statistics)
+            logger.debug(f"Retrieved overview of {len(agents)} agents for project {project_name}")
+            return serialize_mongo_document(overview)
             
-        except PyMongoError as e:
-            logger.error(f"Failed to get agent statistics for project {project_name} and agent {agent_name}: {e}")
+        except (PyMongoError, sqlite3.Error) as e:
+            logger.error(f"Failed to get project overview for project {project_name}: {e}")
             return {}
         except Exception as e:
-            logger.error(f"Unexpected error getting agent statistics: {e}")
+            logger.error(f"Unexpected error getting project overview: {e}")
             return {}
 
+    def export_agent_logs(
+        self,
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        export_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Stream matching agent logs to a gzip NDJSON file, resuming ``export_id`` if given.
+        
+        Args:
+            project_name: Filter by specific project name
+            agent_name: Filter by specific agent name
+            session_id: Filter by specific session ID
+            start_date: Filter logs from this date onwards
+            end_date: Filter logs up to this date
+            export_id: Export to resume (a new one is started when omitted)
+            
+        Returns:
+            Dict[str, Any]: Export id, file path, row count, last exported _id and
+            whether it completed; on failure, the export id and the error
+        """
+        export_id = export_id or self.exporter.new_export_id()
+        try:
+            summary = self.exporter.export(
+                project_name=project_name,
+                agent_name=agent_name,
+                session_id=session_id,
+                start_date=start_date,
+                end_date=end_date,
+                export_id=export_id
+            )
+            
+            logger.debug(f"Export {export_id} wrote {summary['rows']} rows")
+            return summary
+            
+        except (ValueError, ExportInProgressError) as e:
+            logger.error(f"Invalid export request {export_id}: {e}")
+            return {"export_id": export_id, "error": str(e)}
+        except (PyMongoError, sqlite3.Error, OSError) as e:
+            logger.error(f"Export {export_id} interrupted, it can be resumed: {e}")
+            return {"export_id": export_id, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Unexpected error exporting agent logs: {e}")
+            return {"export_id": export_id, "error": str(e)}
+    
+    def get_daily_statistics(
+        self,
+        project_name: str,
+        agent_name: str,
+        day: date,
+        known_version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the statistics of an agent for one day, versioned for caching.
+        
+        Args:
+            project_name: Human-readable name of the project
+            agent_name: Agent name to get statistics for
+            day: Day to summarize
+            known_version: Version the caller already holds (like If-None-Match)
+            
+        Returns:
+            Dict[str, Any]: Version, immutable flag and statistics, or only
+            ``not_modified`` when ``known_version`` is still current
+        """
+        start_date, end_date = datetime.combine(day, time.min), datetime.combine(day, time.max)
+        return self._get_daily_resource(
+            "statistics", project_name, agent_name, day, known_version,
+            lambda: {"statistics": self._build_statistics(project_name, agent_name, start_date, end_date)}
+        )
+    
+    def get_daily_logs(
+        self,
+        project_name: str,
+        agent_name: str,
+        day: date,
+        known_version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the newest log entries of an agent for one day, versioned for caching.
+        
+        Args:
+            project_name: Human-readable name of the project
+            agent_name: Agent name to get logs for
+            day: Day to read
+            known_version: Version the caller already holds (like If-None-Match)
+            
+        Returns:
+            Dict[str, Any]: Version, immutable flag, up to RESOURCE_DAY_LOGS_LIMIT
+            entries and a truncated flag, or only ``not_modified`` when
+            ``known_version`` is still current
+        """
+        start_date, end_date = datetime.combine(day, time.min), datetime.combine(day, time.max)
+        limit = EnvVariables.RESOURCE_DAY_LOGS_LIMIT
+        
+        def load() -> Dict[str, Any]:
+            logs = self._find_logs(project_name, agent_name, None, start_date, end_date, limit + 1)
+            return {"logs": logs[:limit], "truncated": len(logs) > limit}
+        
+        return self._get_daily_resource("logs", project_name, agent_name, day, known_version, load)
+    
+    def _get_daily_resource(
+        self,
+        kind: str,
+        project_name: str,
+        agent_name: str,
+        day: date,
+        known_version: Optional[str],
+        load: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Serve a per-agent, per-day resource from the cache when its version is current.
+        
+        The version is the agent's write counter for the day, read before
+        loading so a concurrent write can only make the cached body newer
+        than its version. Closed days are cached as immutable and served
+        without touching the database.
+        """
+        key = (kind, project_name, agent_name, day)
+        immutable = self.is_closed_day(day)
+        try:
+            cached = self.resource_cache.get_immutable(key)
+            if cached is not None:
+                version, body = cached
+            else:
+                version = str(self.repository.get_write_count(project_name, agent_name, datetime.combine(day, time.min)))
+                body = self.resource_cache.get(key, version)
+                if body is None:
+                    body = load()
+                self.resource_cache.put(key, version, body, immutable=immutable)
+            
+        except (PyMongoError, sqlite3.Error) as e:
+            logger.error(f"Failed to get daily {kind} for project {project_name} and agent {agent_name}: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Unexpected error getting daily {kind}: {e}")
+            return {}
+        
+        resource = {
+            "project_name": project_name,
+            "agent_name": agent_name,
+            "day": day.isoformat(),
+            "version": version,
+            "immutable": immutable
+        }
+        if known_version == version:
+            resource["not_modified"] = True
+        else:
+            resource.update(body)
+        return resource
+    
+    @staticmethod
+    def is_closed_day(day: date) -> bool:
+        """Whether ``day`` ended more than RESOURCE_CLOSED_DAY_GRACE_SECONDS ago."""
+        closes_at = datetime.combine(day + timedelta(days=1), time.min)
+        return datetime.now() >= closes_at + timedelta(seconds=EnvVariables.RESOURCE_CLOSED_DAY_GRACE_SECONDS)
+    
+    def close(self):
+        """Flush buffered writes and release the storage backend."""
+        self.live_tail.stop()
+        self.retention.stop()
+        self.repository.close()
+
 
 # Global Agents Logger instance
 agents_logger = AgentsLogger()
+
+# O lifespan roda a cada requisição no modo stateless_http, então o flush
+# final dos writes em buffer fica atrelado ao encerramento do processo.
+atexit.register(agents_logger.close)
@@ -0,0 +1,156 @@
+"""
+Export Module
+
+Streams filtered agent logs to gzip-compressed NDJSON files under
+``EXPORT_PATH`` for offline analysis. Entries are read in ``_id`` order one
+batch at a time, so memory use does not depend on the size of the export.
+
+Each batch is appended as its own gzip member and then recorded in a
+sidecar ``<export_id>.state.json`` (filters, rows, last ``_id`` and the file
+size). Calling the export again with the same ``export_id`` truncates any
+half-written batch and resumes after the last recorded ``_id``.
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+from config.env_variables import EnvVariables
+from logs.logging import get_logger
+
+logger = get_logger("export")
+
+EXPORT_SUFFIX = ".ndjson.gz"
+STATE_SUFFIX = ".state.json"
+EXPORT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+class ExportInProgressError(RuntimeError):
+    """Raised when an export with the same id is already running."""
+
+
+class LogExporter:
+    """Resumable streaming export of agent logs."""
+
+    def __init__(
+        self,
+        repository,
+        serializer: Callable[[Dict[str, Any]], Dict[str, Any]],
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.repository = repository
+        self.serializer = serializer
+        self.path = path or EnvVariables.EXPORT_PATH
+        self.batch_size = batch_size or EnvVariables.EXPORT_BATCH_SIZE
+
+        self._lock = threading.Lock()
+        self._running: Set[str] = set()
+
+    def export(
+        self,
+        project_name: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        session_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        export_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run (or resume) an export and return its summary.
+
+        When ``export_id`` names an existing export, its stored filters are
+        used and the filters passed here are ignored.
+        """
+        export_id = export_id or self.new_export_id()
+        if not EXPORT_ID_PATTERN.match(export_id):
+            raise ValueError("export_id may only contain letters, digits, '_' and '-'")
+
+        with self._lock:
+            if export_id in self._running:
+                raise ExportInProgressError(f"Export {export_id} is already running")
+            self._running.add(export_id)
+        try:
+            return self._run(export_id, {
+                "project_name": project_name,
+                "agent_name": agent_name,
+                "session_id": session_id,
+                "start_date": start_date.isoformat() if start_date else None,
+                "end_date": end_date.isoformat() if end_date else None
+            })
+        finally:
+            with self._lock:
+                self._running.discard(export_id)
+
+    @staticmethod
+    def new_export_id() -> str:
+        return f"agents_logs_{datetime.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:8]}"
+
+    def _run(self, export_id: str, filters: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        os.makedirs(self.path, exist_ok=True)
+        data_path = os.path.join(self.path, f"{export_id}{EXPORT_SUFFIX}")
+        state = self._load_state(export_id)
+
+        if state is None:
+            state = {"export_id": export_id, "filters": filters, "rows": 0, "last_id": None, "bytes": 0, "complete": False}
+            open(data_path, "wb").close()
+        elif not state["complete"]:
+            if not os.path.exists(data_path) or os.path.getsize(data_path) < state["bytes"]:
+                raise ValueError(f"Export file of {export_id} is missing or shorter than its recorded state")
+            # Descarta o lote interrompido depois do último estado gravado
+            with open(data_path, "ab") as file:
+                file.truncate(state["bytes"])
+            logger.info(f"Resuming export {export_id} after _id {state['last_id']} ({state['rows']} rows)")
+
+        if not state["complete"]:
+            stored = state["filters"]
+            batches = self.repository.iter_log_batches(
+                project_name=stored["project_name"],
+                agent_name=stored["agent_name"],
+                session_id=stored["session_id"],
+                start_date=datetime.fromisoformat(stored["start_date"]) if stored["start_date"] else None,
+                end_date=datetime.fromisoformat(stored["end_date"]) if stored["end_date"] else None,
+                after_id=state["last_id"],
+                batch_size=self.batch_size
+            )
+            for batch in batches:
+                serialized = [self.serializer(document) for document in batch]
+                with gzip.open(data_path, "at", encoding="utf-8") as file:
+                    file.writelines(json.dumps(document, separators=(",", ":")) + "\n" for document in serialized)
+
+                state["rows"] += len(serialized)
+                state["last_id"] = serialized[-1]["_id"]
+                state["bytes"] = os.path.getsize(data_path)
+                self._save_state(export_id, state)
+
+            state["complete"] = True
+            self._save_state(export_id, state)
+            logger.info(f"Exported {state['rows']} agent logs to {data_path}")
+
+        return {
+            "export_id": export_id,
+            "path": os.path.abspath(data_path),
+            "rows": state["rows"],
+            "last_id": state["last_id"],
+            "complete": state["complete"]
+        }
+
+    def _state_path(self, export_id: str) -> str:
+        return os.path.join(self.path, f"{export_id}{STATE_SUFFIX}")
+
+    def _load_state(self, export_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._state_path(export_id), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def _save_state(self, export_id: str, state: Dict[str, Any]):
+        """Replace the sidecar atomically, so a crash never leaves it half-written."""
+        state_path = self._state_path(export_id)
+        with open(f"{state_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.replace(f"{state_path}.tmp", state_path)
@@ -0,0 +1,235 @@
+"""
+Live Tail Module
+
+Fans out new agent log entries to MCP resource subscribers.
+
+A single source feeds every subscriber: a shared MongoDB change stream
+when the deployment is a replica set (or sharded cluster), otherwise the
+ingestion path of this process. Entries are kept serialized in a bounded
+buffer per project/agent, so reading the tail never touches the database.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlsplit
+from pydantic import AnyUrl
+from pymongo.errors import OperationFailure, PyMongoError
+from config.env_variables import EnvVariables
+from logs.logging import get_logger
+
+logger = get_logger("live_tail")
+
+TAIL_URI_SCHEME = "agents-tail"
+
+# Código do MongoDB para resume token que saiu do oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+def parse_tail_uri(uri: str) -> Optional[Tuple[str, str]]:
+    """Extract ``(project_name, agent_name)`` from an ``agents-tail://`` URI."""
+    parts = urlsplit(uri)
+    segments = parts.path.strip("/").split("/")
+    if parts.scheme != TAIL_URI_SCHEME or not parts.netloc or not segments[0]:
+        return None
+    return unquote(parts.netloc), unquote(segments[0])
+
+
+class Subscriber:
+    """A session subscribed to one tail URI."""
+
+    def __init__(self, uri: str, session: Any, loop: asyncio.AbstractEventLoop):
+        self.uri = uri
+        self.session = session
+        self.loop = loop
+        # Evita enfileirar várias notificações enquanto uma ainda não foi entregue;
+        # entradas publicadas nesse meio tempo marcam dirty e geram mais uma ao final
+        self.notifying = False
+        self.dirty = False
+
+
+class LiveTail:
+    """Shared source of new log entries with per-agent buffers and resume tokens."""
+
+    def __init__(self, repository, serializer: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.repository = repository
+        self.serializer = serializer
+        self.buffer_size = EnvVariables.LIVE_TAIL_BUFFER_SIZE
+        self.mode: Optional[str] = None  # "change_stream" | "ingestion"
+
+        self._lock = threading.Lock()
+        self._epoch = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._buffers: Dict[Tuple[str, str], Deque[Tuple[int, Dict[str, Any]]]] = {}
+        self._evicted: Dict[Tuple[str, str], int] = {}
+        self._buffered_events: Dict[Tuple[str, str], Set[str]] = {}
+        self._subscribers: Dict[Tuple[str, str], List[Subscriber]] = {}
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._stream_resume_token = None
+
+    def ensure_started(self):
+        """Pick the entry source the first time the tail is used."""
+        with self._lock:
+            if self.mode:
+                return
+            try:
+                use_change_stream = self.repository.supports_change_streams()
+            except PyMongoError as e:
+                logger.warning(f"Could not check change stream support, using ingestion path: {e}")
+                use_change_stream = False
+
+            if use_change_stream:
+                self.mode = "change_stream"
+                self._watcher = threading.Thread(target=self._watch, name="live-tail-watcher", daemon=True)
+                self._watcher.start()
+            else:
+                self.mode = "ingestion"
+            logger.info(f"Live tail started using the {self.mode} source")
+
+    def publish_ingested(self, entry: Dict[str, Any]):
+        """Publish an entry written by this process when there is no change stream."""
+        if self.mode == "ingestion":
+            self.publish(entry)
+
+    def publish(self, entry: Dict[str, Any]):
+        """Buffer an entry and notify the subscribers of its project/agent."""
+        key = (entry["project_name"], entry["agent_name"])
+        event_id = entry.get("event_id")
+        document = self.serializer(entry)
+
+        with self._lock:
+            # Retry de um evento ainda no buffer (o SQLite só descarta duplicatas no flush)
+            events = self._buffered_events.setdefault(key, set())
+            if event_id is not None and event_id in events:
+                return
+            self._sequence += 1
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = deque(maxlen=self.buffer_size)
+            elif len(buffer) == buffer.maxlen:
+                self._evicted[key] = buffer[0][0]
+                events.discard(buffer[0][1].get("event_id"))
+            buffer.append((self._sequence, document))
+            if event_id is not None:
+                events.add(event_id)
+            subscribers = list(self._subscribers.get(key, ()))
+
+        for subscriber in subscribers:
+            self._notify(key, subscriber)
+
+    def read(self, project_name: str, agent_name: str, resume_token: Optional[str] = None) -> Dict[str, Any]:
+        """Return the buffered entries after ``resume_token`` (all buffered entries when omitted).
+
+        ``truncated`` is True when entries after the token may have been
+        dropped (buffer overflow or server restart); the caller should then
+        backfill with ``get_agents_logs``.
+        """
+        self.ensure_started()
+        after = self._parse_resume_token(resume_token)
+
+        key = (project_name, agent_name)
+        with self._lock:
+            buffer = list(self._buffers.get(key, ()))
+            evicted = self._evicted.get(key, 0)
+            sequence = self._sequence
+
+        if after is None:
+            # Token de outro processo (reinício do servidor) ou inválido
+            truncated = resume_token is not None
+            entries = buffer
+        else:
+            entries = [item for item in buffer if item[0] > after]
+            truncated = after < evicted
+
+        return {
+            "project_name": project_name,
+            "agent_name": agent_name,
+            "resume_token": f"{self._epoch}:{sequence}",
+            "truncated": truncated,
+            "entries": [document for _, document in entries]
+        }
+
+    def subscribe(self, project_name: str, agent_name: str, uri: str, session: Any):
+        """Register the session of the current request for update notifications."""
+        self.ensure_started()
+        subscriber = Subscriber(uri, session, asyncio.get_running_loop())
+        with self._lock:
+            subscribers = self._subscribers.setdefault((project_name, agent_name), [])
+            subscribers[:] = [item for item in subscribers if item.session is not session]
+            subscribers.append(subscriber)
+        logger.debug(f"Subscribed to {uri}")
+
+    def unsubscribe(self, project_name: str, agent_name: str, session: Any):
+        key = (project_name, agent_name)
+        with self._lock:
+            self._drop_subscriber(key, lambda item: item.session is session)
+
+    def stop(self):
+        self._stop.set()
+
+    def _notify(self, key: Tuple[str, str], subscriber: Subscriber):
+        with self._lock:
+            if subscriber.notifying:
+                subscriber.dirty = True
+                return
+            subscriber.notifying = True
+            subscriber.dirty = False
+
+        def done(future):
+            failed = future.cancelled() or future.exception() is not None
+            with self._lock:
+                subscriber.notifying = False
+                if failed:
+                    # Sessão encerrada (ex.: requisição stateless já respondida)
+                    self._drop_subscriber(key, lambda item: item is subscriber)
+                    return
+                resend = subscriber.dirty
+            if resend:
+                self._notify(key, subscriber)
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                subscriber.session.send_resource_updated(AnyUrl(subscriber.uri)), subscriber.loop
+            )
+            future.add_done_callback(done)
+        except RuntimeError:
+            # Event loop da sessão já foi encerrado
+            with self._lock:
+                self._drop_subscriber(key, lambda item: item is subscriber)
+
+    def _drop_subscriber(self, key: Tuple[str, str], predicate: Callable[[Subscriber], bool]):
+        subscribers = [item for item in self._subscribers.get(key, ()) if not predicate(item)]
+        if subscribers:
+            self._subscribers[key] = subscribers
+        else:
+            self._subscribers.pop(key, None)
+
+    def _parse_resume_token(self, resume_token: Optional[str]) -> Optional[int]:
+        if not resume_token:
+            return None
+        epoch, _, sequence = resume_token.partition(":")
+        if epoch != self._epoch or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def _watch(self):
+        """Consume the shared change stream, resuming after transient errors."""
+        while not self._stop.is_set():
+            try:
+                with self.repository.watch_inserts(self._stream_resume_token) as stream:
+                    while not self._stop.is_set() and stream.alive:
+                        change = stream.try_next()
+                        self._stream_resume_token = stream.resume_token
+                        if change is not None:
+                            self.publish(self.repository.decode_log(change["fullDocument"]))
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    self._stream_resume_token = None
+                logger.error(f"Live tail change stream failed, restarting: {e}")
+                self._stop.wait(EnvVariables.LIVE_TAIL_RETRY_SECONDS)
+            except PyMongoError as e:
+                logger.error(f"Live tail change stream interrupted, resuming: {e}")
+                self._stop.wait(EnvVariables.LIVE_TAIL_RETRY_SECONDS)
@@ -0,0 +1,189 @@
+"""
+Profiling Module
+
+Opt-in profiling of live tool calls. A configurable fraction of the calls
+runs under ``cProfile`` while a background sampler records their Python
+stacks. Results are aggregated per tool under ``<LOG_PATH>/profiles``:
+
+- ``<tool>.prof``: cumulative ``pstats`` data (``python -m pstats``, snakeviz)
+- ``<tool>.collapsed``: collapsed stacks for flamegraph.pl / speedscope
+
+Files are rewritten with the running aggregate, so disk usage stays bounded
+by ``PROFILING_MAX_BYTES`` no matter how long profiling stays on.
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+from config.env_variables import EnvVariables
+from logs.logging import get_logger
+
+logger = get_logger("profiling")
+
+# Limite de stacks distintas por tool; o excedente é somado em uma única entrada
+MAX_STACKS_PER_TOOL = 10_000
+TRUNCATED_STACK = "[truncated]"
+
+
+class ToolProfiler:
+    """Samples tool calls with cProfile and a statistical stack sampler."""
+
+    def __init__(self):
+        self.enabled = EnvVariables.PROFILING_ENABLED
+        self.sample_rate = EnvVariables.PROFILING_SAMPLE_RATE
+        self.max_bytes = EnvVariables.PROFILING_MAX_BYTES
+        self.sampler_interval = EnvVariables.PROFILING_SAMPLER_INTERVAL_MS / 1000
+        self.path = os.path.join(EnvVariables.LOG_PATH or ".", "profiles")
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._stacks: Dict[str, Counter] = {}
+        self._active: Dict[int, str] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None) -> Dict[str, Any]:
+        """Change the profiling settings at runtime and return the current state."""
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError("sample_rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        logger.info(f"Profiling {'enabled' if self.enabled else 'disabled'} with sample rate {self.sample_rate}")
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = sorted(self._stats)
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "path": self.path,
+            "disk_usage_bytes": self._disk_usage(),
+            "max_bytes": self.max_bytes,
+            "profiled_tools": tools
+        }
+
+    def profiled(self, tool_name: str) -> Callable:
+        """Decorator that profiles a sampled fraction of the calls to a tool."""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or random.random() >= self.sample_rate:
+                    return func(*args, **kwargs)
+
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Outro profiler já ativo nesta thread (chamada aninhada)
+                    return func(*args, **kwargs)
+
+                thread_id = threading.get_ident()
+                self._start_sampling(thread_id, tool_name)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profile.disable()
+                    self._stop_sampling(thread_id)
+                    self._record(tool_name, profile)
+
+            return wrapper
+        return decorator
+
+    def _record(self, tool_name: str, profile: cProfile.Profile):
+        try:
+            with self._lock:
+                stats = self._stats.get(tool_name)
+                if stats is None:
+                    self._stats[tool_name] = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            self._write(tool_name)
+        except Exception as e:
+            # Profiling nunca pode derrubar a chamada da tool
+            logger.error(f"Failed to record profile for {tool_name}: {e}")
+
+    def _write(self, tool_name: str):
+        os.makedirs(self.path, exist_ok=True)
+        prof_path = os.path.join(self.path, f"{tool_name}.prof")
+        collapsed_path = os.path.join(self.path, f"{tool_name}.collapsed")
+
+        with self._lock:
+            stacks = dict(self._stacks.get(tool_name, {}))
+            collapsed = "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+            tmp_prof_path = f"{prof_path}.tmp"
+            self._stats[tool_name].dump_stats(tmp_prof_path)
+
+        # Os arquivos da tool são substituídos; só o crescimento líquido conta no limite
+        current = sum(os.path.getsize(path) for path in (prof_path, collapsed_path) if os.path.exists(path))
+        new = os.path.getsize(tmp_prof_path) + len(collapsed.encode())
+        if self._disk_usage() - current + new > self.max_bytes:
+            os.remove(tmp_prof_path)
+            logger.warning(f"Profiling disk limit of {self.max_bytes} bytes reached, skipping write for {tool_name}")
+            return
+
+        os.replace(tmp_prof_path, prof_path)
+        with open(collapsed_path, "w", encoding="utf-8") as file:
+            file.write(collapsed)
+
+    def _disk_usage(self) -> int:
+        if not os.path.isdir(self.path):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file())
+
+    def _start_sampling(self, thread_id: int, tool_name: str):
+        with self._lock:
+            self._active[thread_id] = tool_name
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_stacks, name="profiling-sampler", daemon=True)
+                self._sampler.start()
+        self._wake.set()
+
+    def _stop_sampling(self, thread_id: int):
+        with self._lock:
+            self._active.pop(thread_id, None)
+
+    def _sample_stacks(self):
+        """Record the stacks of the threads running profiled calls."""
+        while True:
+            with self._lock:
+                active = dict(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                continue
+
+            frames = sys._current_frames()
+            for thread_id, tool_name in active.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                collapsed = ";".join([tool_name, *reversed(stack)])
+
+                with self._lock:
+                    counter = self._stacks.setdefault(tool_name, Counter())
+                    if collapsed not in counter and len(counter) >= MAX_STACKS_PER_TOOL:
+                        collapsed = f"{tool_name};{TRUNCATED_STACK}"
+                    counter[collapsed] += 1
+
+            time.sleep(self.sampler_interval)
+
+
+# Global profiler instance
+tool_profiler = ToolProfiler()
@@ -0,0 +1,92 @@
+"""
+Retention Module
+
+Moves agent logs older than ``RETENTION_DAYS`` from the database into the
+compressed archive, keeping the hot collection, its indexes and working set
+bounded. The latency sketches and daily rollups are left in place, so
+percentiles and distinct counts still cover archived periods.
+"""
+
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+from pymongo.errors import PyMongoError
+from config.env_variables import EnvVariables
+from database.archive import LogArchive
+from logs.logging import get_logger
+
+logger = get_logger("retention")
+
+
+class RetentionJob:
+    """Scheduled job that archives and deletes expired agent logs."""
+
+    def __init__(self, repository, archive: LogArchive, serializer: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.repository = repository
+        self.archive = archive
+        self.serializer = serializer
+        self.retention_days = EnvVariables.RETENTION_DAYS
+        self.interval = EnvVariables.RETENTION_INTERVAL_SECONDS
+        self.batch_size = EnvVariables.RETENTION_BATCH_SIZE
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.retention_days > 0
+
+    def cutoff(self) -> datetime:
+        """Oldest timestamp still kept in the database."""
+        return datetime.now() - timedelta(days=self.retention_days)
+
+    def start(self):
+        """Start the background job once (safe to call on every lifespan)."""
+        with self._lock:
+            if not self.enabled or self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="retention-job", daemon=True)
+            self._thread.start()
+            logger.info(f"Retention job started: keeping {self.retention_days} days, archiving to {self.archive.path}")
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self) -> int:
+        """Archive every expired entry in batches and return how many were moved.
+
+        Each batch is appended to its day partitions before being deleted, so
+        a crash can at worst leave an entry in both places; archive reads
+        deduplicate by ``_id``.
+        """
+        cutoff = self.cutoff()
+        moved = 0
+
+        while not self._stop.is_set():
+            documents = self.repository.find_expired(cutoff, self.batch_size)
+            if not documents:
+                break
+
+            partitions = defaultdict(list)
+            for document in documents:
+                partitions[document["timestamp"].date()].append(self.serializer(document))
+            for day, serialized in partitions.items():
+                self.archive.append(day, serialized)
+
+            self.repository.delete_logs([document["_id"] for document in documents])
+            moved += len(documents)
+
+        if moved:
+            logger.info(f"Archived {moved} agent logs older than {cutoff.isoformat()}")
+        return moved
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except (PyMongoError, sqlite3.Error, OSError) as e:
+                logger.error(f"Retention job failed, retrying on next run: {e}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,93 @@
+"""
+Date Utilities
+
+Arithmetic date helpers: business-day counts, lazy day ranges and duration
+math computed in closed form, so their cost does not grow with the length
+of the range or the size of the multiplier.
+
+Weekdays follow ``date.weekday()`` (Monday is 0); Saturday and Sunday are
+the non-business days.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+WEEKEND = (5, 6)
+BUSINESS_DAYS_PER_WEEK = 5
+
+
+class HolidayCalendar:
+    """Sorted set of holidays, counted by binary search."""
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        # Feriados em fim de semana já não contam como dia útil
+        self._days = sorted({as_date(day) for day in holidays if as_date(day).weekday() not in WEEKEND})
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __contains__(self, day: date) -> bool:
+        day = as_date(day)
+        index = bisect_left(self._days, day)
+        return index < len(self._days) and self._days[index] == day
+
+    def count_between(self, start: date, end: date) -> int:
+        """Number of weekday holidays in ``[start, end]``."""
+        return bisect_right(self._days, as_date(end)) - bisect_left(self._days, as_date(start))
+
+
+def as_date(value: date) -> date:
+    """Drop the time part of a ``datetime``; plain dates pass through."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def parse_date(value: str, fmt: str = "%Y-%m-%d") -> date:
+    return datetime.strptime(value, fmt).date()
+
+
+def weekdays_between(start: date, end: date) -> int:
+    """Number of Monday-to-Friday days in ``[start, end]`` (0 when empty)."""
+    start, end = as_date(start), as_date(end)
+    days = (end - start).days + 1
+    if days <= 0:
+        return 0
+
+    weeks, remainder = divmod(days, 7)
+    # Dias restantes começam no weekday de start; conta quantos caem de segunda a sexta
+    first = start.weekday()
+    last = first + remainder
+    extra = max(0, min(last, BUSINESS_DAYS_PER_WEEK) - first) + max(0, last - 7)
+    return weeks * BUSINESS_DAYS_PER_WEEK + extra
+
+
+def business_days_between(start: date, end: date, holidays: Optional[HolidayCalendar] = None) -> int:
+    """Number of business days in ``[start, end]``, minus the given holidays."""
+    count = weekdays_between(start, end)
+    if holidays and count:
+        count -= holidays.count_between(start, end)
+    return count
+
+
+def iter_days(start: date, end: date) -> Iterator[date]:
+    """Lazily yield every day in ``[start, end]``, keeping the input type."""
+    for offset in range((as_date(end) - as_date(start)).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def duration_to_seconds(value: str) -> int:
+    """Parse an ``HH:MM:SS`` duration (hours may exceed 24)."""
+    hours, minutes, seconds = map(int, value.split(":"))
+    return 3600 * hours + 60 * minutes + seconds
+
+
+def format_duration(total_seconds: int) -> str:
+    """Format seconds as ``HH:MM:SS`` (hours are not wrapped at 24)."""
+    hours, rest = divmod(int(total_seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return "%02d:%02d:%02d" % (hours, minutes, seconds)
+
+
+def multiply_duration(value: str, factor: int) -> str:
+    """Multiply an ``HH:MM:SS`` duration by an integer factor."""
+    return format_duration(duration_to_seconds(value) * int(factor))
@@ -0,0 +1,88 @@
+"""
+DDSketch
+
+Mergeable quantile sketch with relative-error guarantees
+(Masson, Rim & Lee, "DDSketch: A fast and fully-mergeable quantile sketch
+with relative-error guarantees", VLDB 2019).
+
+Every positive value ``x`` is counted in bin ``ceil(log_gamma(x))``. Any
+quantile returned is within ``relative_accuracy`` of the true value, and two
+sketches are merged by adding their bin counts, which is what lets the
+storage backends keep one sketch per time bucket with plain increments.
+"""
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+# Valores abaixo disso (incluindo 0) são contados no bin de zeros
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class DDSketch:
+    """Quantile sketch over non-negative values."""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def key(self, value: float) -> Optional[int]:
+        """Return the bin for ``value``, or None when it falls in the zero bin."""
+        if value < MIN_INDEXABLE_VALUE:
+            return None
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def value(self, key: int) -> float:
+        """Representative value of a bin (relative error bounded by the accuracy)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        key = self.key(value)
+        if key is None:
+            self.zero_count += count
+        else:
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+
+    def add_bins(self, bins: Iterable[Tuple[int, int]], zero_count: int = 0, relative_accuracy: Optional[float] = None):
+        """Merge stored bin counts into this sketch.
+
+        Bins recorded with a different accuracy are re-indexed through their
+        representative value, which adds at most that sketch's own error.
+        """
+        self.zero_count += zero_count
+        self.count += zero_count
+
+        if relative_accuracy is None or relative_accuracy == self.relative_accuracy:
+            for key, count in bins:
+                self.bins[key] = self.bins.get(key, 0) + count
+                self.count += count
+        else:
+            source = DDSketch(relative_accuracy)
+            for key, count in bins:
+                self.add(source.value(key), count)
+
+    def merge(self, other: "DDSketch"):
+        self.add_bins(other.bins.items(), other.zero_count, other.relative_accuracy)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0 <= q <= 1); None for an empty sketch."""
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        cumulative = self.zero_count
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative > rank:
+                return self.value(key)
+
+        return self.value(max(self.bins))
@@ -1,7 +1,7 @@
-from dateutil import rrule
 from datetime import datetime
 from logs.logging import get_logger
 from math import floor,log10
+from utils.dates import HolidayCalendar, business_days_between, iter_days, multiply_duration
 
 logger = get_logger("help") 
 
@@ -23,11 +23,14 @@ def timestamp():
     timestamp = datetime.timestamp(now)
     return timestamp
 
+def iter_days_in_range(date_from_str,date_to_str):
+    # Gera os dias sob demanda; ranges de vários anos não são materializados
+    date1 = datetime.strptime(date_from_str, "%Y-%m-%d")
+    date2 = datetime.strptime(date_to_str, "%Y-%m-%d")
+    return iter_days(date1, date2)
+
 def days_in_range(date_from_str,date_to_str):
-    date1 = datetime.strptime(date_from_str, "%Y-%m-%d").date()
-    date1_0 = datetime(date1.year, date1.month, date1.day)
-    date2 = datetime.strptime(date_to_str, "%Y-%m-%d").date()
-    date_list = list(rrule.rrule(rrule.DAILY, dtstart=date1_0, until=date2))
+    date_list = list(iter_days_in_range(date_from_str, date_to_str))
     return date_list
 
 def str_timestamp():
@@ -45,17 +48,11 @@ def str_timestamp():
     timestamp = year+month+day+hour+minute+second
     return timestamp
 
-def valida_dias_uteis_mes(dias_uteis_min=4):
+def valida_dias_uteis_mes(dias_uteis_min=4, feriados: HolidayCalendar = None):
     today = datetime.today()
     mes_0 = today.replace(day=1)
 
-    days = (today-mes_0).days+1
-
-    dias_uteis=0
-    for i in range(days):
-        date = mes_0.replace(day=i+1)
-        weekday = date.weekday()
-        dias_uteis = dias_uteis + 1 if weekday not in [6,5] else dias_uteis
+    dias_uteis = business_days_between(mes_0, today, feriados)
 
     if dias_uteis>=dias_uteis_min:
         return True
@@ -76,11 +73,6 @@ def create_directory(directory_name):
         raise Exception('Não foi possível criar o diretório')
 
 def multiply_time(time_str,multiply_factor):
-    if (not time_str) or (not multiply_factor):
+    if (not time_str) or (not multiply_factor) or int(multiply_factor) <= 0:
         return "00:00:00"
-    lines = [time_str]*int(multiply_factor)
-    total = 0
-    for line in lines:
-        h, m, s = map(int, line.split(":"))
-        total += 3600*h + 60*m + s
-    return("%02d:%02d:%02d" % (total / 3600, total / 60 % 60, total % 60))
\ No newline at end of file
+    return multiply_duration(time_str, multiply_factor)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+HyperLogLog
+
+Approximate distinct counting (Flajolet et al., 2007) with the small-range
+correction from Heule, Nunkesser & Hall, "HyperLogLog in Practice", 2013.
+
+A value is hashed to 64 bits: the first ``precision`` bits select a
+register and the register keeps the largest run of leading zeros (+1) seen
+in the remaining bits. Sketches merge by taking the per-register maximum,
+so the storage backends update registers with ``max`` upserts and merge
+them at query time. The standard error is ``1.04 / sqrt(2 ** precision)``.
+"""
+
+import hashlib
+import math
+from typing import Iterable, Tuple
+
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+
+def hash64(value: str) -> int:
+    """Stable 64-bit hash (Python's ``hash`` is randomized per process)."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Distinct-count sketch with ``2 ** precision`` registers."""
+
+    def __init__(self, precision: int = 12):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def register(self, value: str) -> Tuple[int, int]:
+        """Return the ``(index, rank)`` register update for ``value``."""
+        hashed = hash64(value)
+        width = 64 - self.precision
+        index = hashed >> width
+        remainder = hashed & ((1 << width) - 1)
+        return index, width - remainder.bit_length() + 1
+
+    def add(self, value: str):
+        index, rank = self.register(value)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add_registers(self, registers: Iterable[Tuple[int, int]], precision: int):
+        """Merge stored registers, folding them down when recorded with a higher precision."""
+        if precision < self.precision:
+            raise ValueError("cannot merge registers recorded with a lower precision")
+
+        shift = precision - self.precision
+        low_mask = (1 << shift) - 1
+        for index, rank in registers:
+            if shift:
+                # Os bits descartados do índice passam a ser os primeiros bits do restante do hash
+                dropped = index & low_mask
+                index >>= shift
+                rank = shift - dropped.bit_length() + 1 if dropped else shift + rank
+            if rank > self.registers[index]:
+                self.registers[index] = rank
+
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimate = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting é mais preciso enquanto há registradores vazios
+            estimate = m * math.log(m / zeros)
+
+        return round(estimate)
@@ -0,0 +1,51 @@
+"""
+Versioned Cache
+
+Bounded LRU cache whose entries carry the version they were computed for.
+A lookup only hits when the caller's current version matches, so entries
+invalidate themselves as soon as the underlying data changes. Entries
+stored as immutable are served without checking the version at all.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class VersionedCache:
+    """Thread-safe LRU of ``key -> (version, immutable, value)``."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[str, bool, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_immutable(self, key: Hashable) -> Optional[Tuple[str, Any]]:
+        """Return ``(version, value)`` if ``key`` was stored as immutable."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry[1]:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[2]
+
+    def get(self, key: Hashable, version: str) -> Optional[Any]:
+        """Return the value cached for ``key`` if it was computed for ``version``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key: Hashable, version: str, value: Any, immutable: bool = False):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, immutable, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)